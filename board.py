@@ -4,6 +4,9 @@
 # DESCRIPTION: This program implements the Board class
 ###################################################################
 
+import dice_dictionary
+import dictionary_cache
+
 FILE_PATH = "boggle_dict.txt"
 
 
@@ -11,14 +14,21 @@ class Board:
     """
     This class represents a single board
     """
-    def __init__(self, board_size):
+    def __init__(self, board_size, cols=None, dice_list=None):
         """
         This function initializes a new instance
-        :param board_size:
+        :param board_size: Integer - number of rows
+        :param cols: Integer - number of columns, None for a square board
+        :param dice_list: List of lists of strings - the dice that can land
+        on the board, to load only the words they can spell, or None for
+        the whole dictionary
         """
         self.__board_size = board_size
+        self.__cols = board_size if cols is None else cols
+        self.__dice_list = dice_list
         self.__cells = self.create_cells()
         self.__board = []
+        self.__words_path = FILE_PATH
         self.__words_list = self.init_words(FILE_PATH)
 
     def init_board(self, game_board):
@@ -31,15 +41,17 @@ class Board:
 
     def init_words(self, file_path):
         """
-        This function loads the words from the dictionary to the words list
+        This function loads the words from the dictionary to a prefix trie.
+        The trie is shared by all the boards that use the same file. If the
+        board's dice are known, only the words they can spell are loaded
         :param file_path: String - path to the dictionary file
-        :return: List of string - words list
+        :return: Trie - words of the dictionary
         """
-        final_list = []
-        with open(file_path) as f:
-            for word in f:
-                final_list.append(word.strip())
-        return final_list
+        if self.__dice_list is not None:
+            file_path = dice_dictionary.get_dictionary_path(
+                file_path, self.__dice_list, self.__board_size * self.__cols)
+        self.__words_path = file_path
+        return dictionary_cache.get_dictionary(file_path)
 
     def get_cells(self):
         """
@@ -59,10 +71,18 @@ class Board:
             return self.__board[x][y]
         return
 
+    def get_words_path(self):
+        """
+        This function returns the path of the dictionary file the board's
+        words were loaded from
+        :return: String - path to the dictionary file
+        """
+        return self.__words_path
+
     def get_words_list(self):
         """
-        This function returns the board's words list
-        :return:
+        This function returns the board's words
+        :return: Trie - words of the dictionary
         """
         return self.__words_list
 
@@ -73,10 +93,17 @@ class Board:
         """
         lst = []
         for i in range(self.__board_size):
-            for j in range(self.__board_size):
+            for j in range(self.__cols):
                 lst.append(self.get_cube_value(i, j))
         return lst
 
+    def get_size(self):
+        """
+        This function returns the board's size
+        :return: Tuple - (number of rows, number of columns)
+        """
+        return self.__board_size, self.__cols
+
     def get_board(self):
         """
         This function returns the board
@@ -90,4 +117,4 @@ class Board:
         :return: List of tuples - board cells
         """
         return [(i, j) for i in range(self.__board_size)
-                for j in range(self.__board_size)]
+                for j in range(self.__cols)]
@@ -0,0 +1,302 @@
+###################################################################
+# FILE: board_generator.py
+# WRITER: Daniel Sinai
+# DESCRIPTION: This program generates boards that meet quality
+#              constraints, ahead of time in a background worker
+###################################################################
+import argparse
+import json
+import queue
+import random
+import sys
+import threading
+import time
+
+import boggle_board_randomizer as bbr
+import boggle_utils as utils
+import dice_dictionary
+import dictionary_cache
+import solve_cache
+from board import FILE_PATH
+
+DEFAULT_MIN_WORDS = 40
+DEFAULT_CELLS = 16
+DEFAULT_MAX_ATTEMPTS = 1000
+DEFAULT_QUEUE_SIZE = 4
+DEFAULT_SCORE_POWER = 2
+
+_generators = {}
+_lock = threading.Lock()
+
+
+class BoardGenerator:
+    """
+    This class samples random boards until one meets the given constraints.
+    Every candidate is solved with solve_board and rejected if its total
+    score, its number of words or its longest word fall outside the limits.
+    A background worker can keep a queue of ready boards, so taking a board
+    does not wait for the sampling. If a limit of attempts is given and no
+    candidate meets the constraints in time, a board that does not meet
+    them is returned, so a constraint the board size can not reach does
+    not stall the game
+    """
+    def __init__(self, words, rows=bbr.BOARD_SIZE, cols=None, dice_list=None,
+                 min_score=None, max_score=None, min_words=None,
+                 max_words=None, min_word_length=None,
+                 score_power=DEFAULT_SCORE_POWER, max_attempts=None,
+                 cache=None):
+        """
+        This function initializes a new instance. A constraint that is None
+        is not checked
+        :param words: Trie or list of strings - words from the dictionary
+        :param rows: Integer - number of rows of the boards
+        :param cols: Integer - number of columns, None for square boards
+        :param dice_list: List of lists of strings - dice, None for the dice
+        set that fits the board size
+        :param min_score: Integer - lowest total score of a board
+        :param max_score: Integer - highest total score of a board
+        :param min_words: Integer - lowest number of words on a board
+        :param max_words: Integer - highest number of words on a board
+        :param min_word_length: Integer - length of a word that must be on
+        the board
+        :param score_power: Integer - a word scores its path length to this
+        power
+        :param max_attempts: Integer - candidates to try for a board before
+        giving up on the constraints, None for no limit
+        :param cache: SolveCache that the accepted boards are stored in, so
+        they are not solved again later, or None
+        """
+        self.__words = utils.as_trie(words)
+        self.__rows = rows
+        self.__cols = rows if cols is None else cols
+        self.__dice_list = dice_list or bbr.get_dice(self.__rows, self.__cols)
+        self.__min_score = min_score
+        self.__max_score = max_score
+        self.__min_words = min_words
+        self.__max_words = max_words
+        self.__min_word_length = min_word_length
+        self.__score_power = score_power
+        self.__max_attempts = max_attempts
+        self.__cache = cache
+        self.__candidates = 0
+        self.__accepted = 0
+        self.__seconds = 0.0
+        self.__stats_lock = threading.Lock()
+        self.__ready = None
+        self.__worker = None
+        self.__stop = threading.Event()
+
+    def get_score(self, answers):
+        """
+        This function calculates the total score of a solved board
+        :param answers: Dictionary - word to its highest scoring path
+        :return: Integer - score
+        """
+        return sum(len(path) ** self.__score_power
+                   for path in answers.values())
+
+    def is_accepted(self, answers):
+        """
+        This function checks if a solved board meets the constraints
+        :param answers: Dictionary - word to its highest scoring path
+        :return: Boolean
+        """
+        if self.__min_words is not None and len(answers) < self.__min_words:
+            return False
+        if self.__max_words is not None and len(answers) > self.__max_words:
+            return False
+        if self.__min_word_length is not None and \
+                not any(len(word) >= self.__min_word_length
+                        for word in answers):
+            return False
+        if self.__min_score is None and self.__max_score is None:
+            return True
+        score = self.get_score(answers)
+        return (self.__min_score is None or score >= self.__min_score) and \
+            (self.__max_score is None or score <= self.__max_score)
+
+    def generate(self, max_attempts=None):
+        """
+        This function samples boards until one meets the constraints
+        :param max_attempts: Integer - candidates to try, None for no limit
+        :return: Tuple - (board, dictionary of word to its highest scoring
+        path), or None if no candidate was accepted
+        """
+        attempts = 0
+        while max_attempts is None or attempts < max_attempts:
+            attempts += 1
+            start = time.perf_counter()
+            board = bbr.randomize_board(self.__dice_list, self.__rows,
+                                        self.__cols)
+            answers = utils.solve_board(board, self.__words)
+            accepted = self.is_accepted(answers)
+            with self.__stats_lock:
+                self.__candidates += 1
+                self.__accepted += accepted
+                self.__seconds += time.perf_counter() - start
+            if accepted:
+                if self.__cache is not None:
+                    self.__cache.store(board, answers)
+                return board, answers
+        return
+
+    def get_stats(self):
+        """
+        This function returns how fast boards are generated
+        :return: Dictionary - number of candidates, number of accepted
+        boards, time spent and boards per second
+        """
+        with self.__stats_lock:
+            seconds = self.__seconds
+            return {"candidates": self.__candidates,
+                    "accepted": self.__accepted, "seconds": seconds,
+                    "candidates_per_sec":
+                        self.__candidates / seconds if seconds else 0.0,
+                    "boards_per_sec":
+                        self.__accepted / seconds if seconds else 0.0}
+
+    def start(self, queue_size=DEFAULT_QUEUE_SIZE):
+        """
+        This function starts a background worker that keeps a queue of
+        ready boards full. Calling it again does nothing
+        :param queue_size: Integer - number of boards to keep ready
+        :return: None
+        """
+        if self.__worker is not None:
+            return
+        self.__ready = queue.Queue(queue_size)
+        self.__stop.clear()
+        self.__worker = threading.Thread(target=self.__fill_queue,
+                                         daemon=True)
+        self.__worker.start()
+
+    def stop(self):
+        """
+        This function stops the background worker. Boards already in the
+        queue can still be taken
+        :return: None
+        """
+        self.__stop.set()
+        if self.__worker is not None:
+            self.__worker.join()
+            self.__worker = None
+
+    def __fill_queue(self):
+        """
+        This function generates boards into the queue until stopped
+        :return: None
+        """
+        while not self.__stop.is_set():
+            result = self.__generate_any()
+            while not self.__stop.is_set():
+                try:
+                    self.__ready.put(result, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+
+    def get_board(self):
+        """
+        This function returns a board that meets the constraints - from the
+        ready queue if there is one, otherwise it is generated now
+        :return: Tuple - (board, dictionary of word to its highest scoring
+        path)
+        """
+        if self.__ready is not None:
+            try:
+                return self.__ready.get_nowait()
+            except queue.Empty:
+                pass
+        return self.__generate_any()
+
+    def __generate_any(self):
+        """
+        This function generates a board that meets the constraints, or any
+        board if none did within the limit of attempts
+        :return: Tuple - (board, dictionary of word to its highest scoring
+        path)
+        """
+        result = self.generate(self.__max_attempts)
+        if result is None:
+            board = bbr.randomize_board(self.__dice_list, self.__rows,
+                                        self.__cols)
+            result = board, utils.solve_board(board, self.__words)
+        return result
+
+
+def get_generator(rows=bbr.BOARD_SIZE, cols=None, min_words=None,
+                  file_path=FILE_PATH):
+    """
+    This function returns a generator shared by the whole process for a
+    board size, with its background worker started
+    :param rows: Integer - number of rows of the boards
+    :param cols: Integer - number of columns, None for square boards
+    :param min_words: Integer - lowest number of words on a board, None for
+    DEFAULT_MIN_WORDS scaled from a 4x4 board to the number of cells
+    :param file_path: String - path to the dictionary file
+    :return: BoardGenerator
+    """
+    cells = rows * (rows if cols is None else cols)
+    if min_words is None:
+        min_words = DEFAULT_MIN_WORDS * cells // DEFAULT_CELLS
+    key = (rows, rows if cols is None else cols, min_words, file_path)
+    with _lock:
+        generator = _generators.get(key)
+        if generator is None:
+            dice_list = bbr.get_dice(rows, cols)
+            words_path = dice_dictionary.get_dictionary_path(
+                file_path, bbr.get_board_dice(dice_list, rows, cols), cells)
+            generator = BoardGenerator(
+                dictionary_cache.get_dictionary(words_path), rows, cols,
+                dice_list, min_words=min_words,
+                max_attempts=DEFAULT_MAX_ATTEMPTS,
+                cache=solve_cache.get_solve_cache(words_path))
+            generator.start()
+            _generators[key] = generator
+    return generator
+
+
+def main():
+    """
+    This function generates boards that meet the given constraints, prints
+    them as JSON lines and reports how fast they were generated
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description="Generate boggle boards")
+    parser.add_argument("--count", type=int, default=10)
+    parser.add_argument("--rows", type=int, default=bbr.BOARD_SIZE)
+    parser.add_argument("--cols", type=int)
+    parser.add_argument("--min-score", type=int)
+    parser.add_argument("--max-score", type=int)
+    parser.add_argument("--min-words", type=int)
+    parser.add_argument("--max-words", type=int)
+    parser.add_argument("--min-word-length", type=int)
+    parser.add_argument("--seed", type=int, help="seed for random boards")
+    parser.add_argument("--dictionary", default=FILE_PATH)
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    dice_list = bbr.get_dice(args.rows, args.cols)
+    generator = BoardGenerator(
+        dice_dictionary.get_dice_dictionary(
+            args.dictionary,
+            bbr.get_board_dice(dice_list, args.rows, args.cols),
+            args.rows * (args.rows if args.cols is None else args.cols)),
+        args.rows, args.cols, dice_list, min_score=args.min_score,
+        max_score=args.max_score, min_words=args.min_words,
+        max_words=args.max_words, min_word_length=args.min_word_length)
+    for _ in range(args.count):
+        board, answers = generator.get_board()
+        print(json.dumps({"board": board, "words": len(answers),
+                          "score": generator.get_score(answers)}))
+    stats = generator.get_stats()
+    print("%d of %d candidates accepted, %.1f boards/sec "
+          "(%.1f candidates/sec)" % (stats["accepted"], stats["candidates"],
+                                     stats["boards_per_sec"],
+                                     stats["candidates_per_sec"]),
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,15 @@
 # WRITER: Daniel Sinai
 # DESCRIPTION: This program implements the controller of the boggle game
 #########################################################################
-import boggle_utils as utils
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import boggle_board_randomizer as bbr
 import boggle_gui as bg
+import board_generator
 from game import Game
+from path_validator import PathValidator
 import tkinter as tk
 from tkinter import messagebox
 
@@ -18,20 +24,122 @@ class BoggleController:
     INVALID_WORD_MSG = "Your word is not in the dictionary or your path is" \
                        " illegal. Please try again"
     FOUND_SAME_WORD_MSG = 'You already found this word'
+    INVALID_TYPED_WORD_MSG = "Your word is not in the dictionary or it can" \
+                             " not be found on the board. Please try again"
     TIME_OVER_MSG = "Your time is over! Would you like to start a new game? "
+    MISSED_WORDS_MSG = "You found %d of the %d words on the board."
+    STARTUP_MSG = "Window shown after %.0f ms"
+    GAME_ERROR_MSG = "The game could not be created:\n%s"
+    POLL_INTERVAL = 20
+    TICK_MARGIN = 1
 
-    def __init__(self):
+    def __init__(self, rows=bbr.BOARD_SIZE, cols=None):
         """
-        This function initializes a new controller
+        This function initializes a new controller. The window is shown
+        right away, while the game is created by a worker thread
+        :param rows: Integer - number of rows of the board
+        :param cols: Integer - number of columns, None for a square board
         """
-        self.__mainframe = Game()
-        self.random_board = self.__mainframe.get_board_values()
-        self.__gui = bg.BoggleGUI(self.random_board,
-                                  self.__mainframe.get_board_object().get_cells(),
-                                  self.reset)
-        self.words_list = self.__mainframe.get_board_object().get_words_list()
+        self.__start_time = time.perf_counter()
+        self.__startup_time = None
+        self.__rows = rows
+        self.__cols = cols
+        self.__executor = ThreadPoolExecutor(max_workers=1)
+        self.__mainframe = None
+        self.__validator = None
+        self.random_board = []
+        self.words_list = None
+        self.__gui = bg.BoggleGUI([], [], self.reset, self.add_cell,
+                                  self.reset_word, self.start_game,
+                                  self.type_word)
         self.__gui.check_word_button.bind("<Button-1>",
                                           func=self.click_check_word)
+        self.__gui.root.after_idle(self.__on_first_paint)
+        self.run_in_background(self.__create_game, self.__on_game_ready)
+
+    def __create_game(self):
+        """
+        This function creates the game and finds the words of its board. It
+        runs in the worker thread
+        :return: Game object
+        """
+        game = Game(self.__rows, self.__cols,
+                    generator=board_generator.get_generator(self.__rows,
+                                                            self.__cols))
+        game.wait_for_answers()
+        return game
+
+    def __on_game_ready(self, game):
+        """
+        This function shows the board of a created game
+        :param game: Game object
+        :return: None
+        """
+        self.__mainframe = game
+        self.random_board = game.get_board_values()
+        self.words_list = game.get_board_object().get_words_list()
+        self.__validator = PathValidator(game.get_board_as_list(),
+                                         self.words_list)
+        self.__gui.set_board(self.random_board,
+                             game.get_board_object().get_cells())
+
+    def __on_first_paint(self):
+        """
+        This function records how long it took to show the window
+        :return: None
+        """
+        self.__startup_time = time.perf_counter() - self.__start_time
+
+    def get_startup_time(self):
+        """
+        This function returns how long it took from creating the controller
+        until the window was first shown
+        :return: Float - seconds, or None if it was not shown yet
+        """
+        return self.__startup_time
+
+    def run_in_background(self, function, callback, *args):
+        """
+        This function runs a function in the worker thread, so the window
+        keeps responding, and calls a callback with its result on the Tk
+        thread once it is done
+        :param function: Function to run
+        :param callback: Function called with the result
+        :param args: Arguments for the function
+        :return: None
+        """
+        future = self.__executor.submit(function, *args)
+        self.__poll(future, callback)
+
+    def __poll(self, future, callback):
+        """
+        This function checks if a background function is done, and checks
+        again after POLL_INTERVAL milliseconds if it is not
+        :param future: Future of the function
+        :param callback: Function called with the result
+        :return: None
+        """
+        if future.done():
+            try:
+                result = future.result()
+            except Exception as e:
+                self.__on_error(e)
+            else:
+                callback(result)
+        else:
+            self.__gui.root.after(self.POLL_INTERVAL, self.__poll, future,
+                                  callback)
+
+    def __on_error(self, error):
+        """
+        This function shows an error of a background function and closes
+        the window, since the game can not go on without its result
+        :param error: Exception raised by the function
+        :return: None
+        """
+        messagebox.showerror("Error", self.GAME_ERROR_MSG % error)
+        self.__gui.root.destroy()
+        self.__executor.shutdown(wait=False)
 
     def get_gui(self):
         """
@@ -40,6 +148,52 @@ class BoggleController:
         """
         return self.__gui
 
+    def start_game(self):
+        """
+        This function handles an event where the player starts the game.
+        The game's clock is started and the timer is refreshed from it
+        :return: None
+        """
+        self.__mainframe.start_timer()
+        self.__tick()
+
+    def __tick(self):
+        """
+        This function shows the time left and schedules itself for the next
+        change of the shown seconds, or ends the game when time is over.
+        The time is read from the game's clock, so late refreshes do not
+        delay the end of the game
+        :return: None
+        """
+        timer = self.__mainframe.get_timer()
+        self.__gui.show_time(timer.get_seconds_left())
+        if timer.is_over():
+            self.reset()
+        else:
+            delay = int(timer.get_next_tick() * 1000) + self.TICK_MARGIN
+            self.__gui.root.after(delay, self.__tick)
+
+    def add_cell(self, cell):
+        """
+        This function handles an event where the player adds a letter to the
+        current word. The letters that can no longer make up a word are
+        greyed out
+        :param cell: Tuple - the cell of the letter
+        :return: None
+        """
+        self.__validator.add_cell(cell)
+        self.__gui.show_dead_ends(set(self.__validator.get_next_cells()))
+
+    def reset_word(self):
+        """
+        This function handles an event where the current word is reset
+        :return: None
+        """
+        if self.__validator is None:
+            return
+        self.__validator.reset()
+        self.__gui.show_dead_ends(set(self.__validator.get_next_cells()))
+
     def click_check_word(self, event):
         """
         This function handles an event where the player selects letters and
@@ -47,28 +201,57 @@ class BoggleController:
         :param event: Object
         :return: None
         """
-        potential_word = utils.is_valid_path(self.__mainframe.get_board_as_list(),
-                                             self.__gui.get_current_word_path(),
-                                             self.words_list)
+        if self.__validator is None:
+            return "break"
+        potential_word = self.__validator.get_word()
         if potential_word in self.__gui.words_found:
             tk.messagebox.showinfo("Word already found",
                                    self.FOUND_SAME_WORD_MSG)
             self.__gui.reset_word()
         elif potential_word:
-            self.__gui.current_score += self.__mainframe.calculate_word_score(
+            _, score = self.__mainframe.submit_path(
                 self.__gui.get_current_word_path())
-            self.__gui.update_score()
-            self.__gui.update_words_found_list(potential_word)
-            self.__gui.update_words_found_frame()
+            self.__add_found_word(potential_word, score)
             self.__gui.reset_word()
         else:
             tk.messagebox.showinfo("Invalid Word", self.INVALID_WORD_MSG)
             self.__gui.reset_word()
         return "break"
 
+    def type_word(self, text):
+        """
+        This function handles an event where the player types a word. The
+        game finds the word's highest scoring path on the board, and the
+        word counts like one chosen with the letters
+        :param text: String - the typed word
+        :return: None
+        """
+        word, score = self.__mainframe.submit_word(text)
+        if word is None:
+            tk.messagebox.showinfo("Invalid Word",
+                                   self.INVALID_TYPED_WORD_MSG)
+        elif word in self.__gui.words_found:
+            tk.messagebox.showinfo("Word already found",
+                                   self.FOUND_SAME_WORD_MSG)
+        else:
+            self.__add_found_word(word, score)
+
+    def __add_found_word(self, word, score):
+        """
+        This function shows a new word the player found and its score
+        :param word: String - word
+        :param score: Integer - score of the word
+        :return: None
+        """
+        self.__gui.current_score += score
+        self.__gui.update_score()
+        self.__gui.update_words_found_list(word)
+        self.__gui.update_words_found_frame()
+
     def run(self):
         """
-        This function runs the game
+        This function runs the game. The words of the board are found before
+        the player can start the timer
         :return: None
         """
         self.__gui.run()
@@ -79,15 +262,31 @@ class BoggleController:
         choose to play again
         :return: None
         """
-        time_over = messagebox.askquestion("Time's Up", self.TIME_OVER_MSG)
+        answers = self.__mainframe.get_answers()
+        missed = self.__mainframe.get_words_remaining(self.__gui.words_found)
+        summary = self.MISSED_WORDS_MSG % (len(answers) - missed, len(answers))
+        time_over = messagebox.askquestion("Time's Up",
+                                           summary + "\n" + self.TIME_OVER_MSG)
         if time_over == "no":
             self.__gui.root.destroy()
+            self.__executor.shutdown(wait=False)
         else:
             self.__gui.root.destroy()
-            new_game = BoggleController()
+            self.__executor.shutdown(wait=False)
+            new_game = BoggleController(self.__rows, self.__cols)
             new_game.run()
 
 
 if __name__ == "__main__":
-    new = BoggleController()
+    parser = argparse.ArgumentParser(description="Boggle game")
+    parser.add_argument("rows", type=int, nargs="?", default=bbr.BOARD_SIZE)
+    parser.add_argument("cols", type=int, nargs="?")
+    parser.add_argument("--timing", action="store_true",
+                        help="print how long the window took to show")
+    args = parser.parse_args()
+    new = BoggleController(args.rows, args.cols)
+    if args.timing:
+        new.get_gui().root.after(
+            1000, lambda: print(BoggleController.STARTUP_MSG %
+                                (new.get_startup_time() * 1000)))
     new.run()
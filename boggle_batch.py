@@ -0,0 +1,161 @@
+###################################################################
+# FILE: boggle_batch.py
+# WRITER: Daniel Sinai
+# DESCRIPTION: This program solves many boggle boards in parallel
+#              over a pool of processes
+###################################################################
+import argparse
+import json
+import multiprocessing
+import random
+import sys
+import time
+
+import boggle_board_randomizer as bbr
+import boggle_utils as utils
+import dictionary_cache
+import solve_cache
+from board import FILE_PATH
+from game import Game
+
+DEFAULT_CHUNKSIZE = 16
+
+_worker_words = None
+_worker_cache = None
+
+
+def init_worker(file_path, cache_path=None):
+    """
+    This function loads the dictionary once in every worker process
+    :param file_path: String - path to the dictionary file
+    :param cache_path: String - path to the SQLite file of solved boards,
+    shared by all the workers, or None to solve every board
+    :return: None
+    """
+    global _worker_words, _worker_cache
+    _worker_words = dictionary_cache.get_dictionary(file_path)
+    _worker_cache = None
+    if cache_path is not None:
+        _worker_cache = solve_cache.get_solve_cache(file_path, cache_path)
+
+
+def get_worker_words():
+    """
+    This function returns the dictionary that init_worker loaded in this
+    worker process
+    :return: Trie - words from the dictionary
+    """
+    return _worker_words
+
+
+def solve_worker(board):
+    """
+    This function solves a single board inside a worker process, through
+    the solve cache if the workers have one
+    :param board: List of lists - board
+    :return: Tuple - (board, total score, dictionary of word to path)
+    """
+    if _worker_cache is not None:
+        words_dict = _worker_cache.solve_board(board)
+    else:
+        words_dict = utils.solve_board(board, _worker_words)
+    score = sum(len(path) ** Game.SCORE_POWER
+                for path in words_dict.values())
+    return board, score, words_dict
+
+
+def random_boards(count, dice_list=bbr.LETTERS):
+    """
+    This function generates random boards
+    :param count: Integer - number of boards
+    :param dice_list: List of lists of strings - dice
+    :return: Iterator of boards
+    """
+    for _ in range(count):
+        yield bbr.randomize_board(dice_list)
+
+
+def solve_boards(boards, processes=None, chunksize=DEFAULT_CHUNKSIZE,
+                 file_path=FILE_PATH,
+                 cache_path=solve_cache.DEFAULT_CACHE_PATH):
+    """
+    This function solves boards over a pool of processes. The results are
+    yielded as soon as they are ready, not in the order of the boards
+    :param boards: Iterable of boards
+    :param processes: Integer - number of workers, None for one per core
+    :param chunksize: Integer - number of boards sent to a worker at once
+    :param file_path: String - path to the dictionary file
+    :param cache_path: String - path to the SQLite file of solved boards,
+    or None to solve every board
+    :return: Iterator of tuples - see solve_worker
+    """
+    with multiprocessing.Pool(processes, initializer=init_worker,
+                              initargs=(file_path, cache_path)) as pool:
+        for result in pool.imap_unordered(solve_worker, boards, chunksize):
+            yield result
+
+
+def read_boards(f):
+    """
+    This function reads boards written one JSON per line - either a list of
+    lists or an object with a "board" key, like the lines main writes
+    :param f: File object
+    :return: Iterator of boards
+    """
+    for line in f:
+        if line.strip():
+            board = json.loads(line)
+            yield board["board"] if isinstance(board, dict) else board
+
+
+def main():
+    """
+    This function runs the batch solver from the command line. Every solved
+    board is written to the output as one JSON line
+    :return: None
+    """
+    parser = argparse.ArgumentParser(
+        description="Solve many boggle boards in parallel")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--count", type=int,
+                        help="number of random boards to generate")
+    source.add_argument("--input", type=argparse.FileType("r"),
+                        help="file of boards, one JSON board per line "
+                             "('-' for stdin)")
+    parser.add_argument("--seed", type=int, help="seed for random boards")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--dictionary", default=FILE_PATH)
+    parser.add_argument("--no-cache", action="store_true",
+                        help="solve every board, without the solve cache")
+    parser.add_argument("--paths", action="store_true",
+                        help="write the path of every word, not only the "
+                             "words")
+    args = parser.parse_args()
+
+    if args.count is not None:
+        if args.seed is not None:
+            random.seed(args.seed)
+        boards = random_boards(args.count)
+    else:
+        boards = read_boards(args.input)
+
+    start = time.perf_counter()
+    solved = 0
+    cache_path = None if args.no_cache else solve_cache.DEFAULT_CACHE_PATH
+    for board, score, words_dict in solve_boards(boards, args.processes,
+                                                 args.chunksize,
+                                                 args.dictionary,
+                                                 cache_path):
+        words = words_dict if args.paths else list(words_dict)
+        print(json.dumps({"board": board, "score": score,
+                          "words": words}))
+        solved += 1
+    elapsed = time.perf_counter() - start
+    print("%d boards in %.2f sec, %.1f boards/sec"
+          % (solved, elapsed, solved / elapsed if elapsed else 0.0),
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+###################################################################
+# FILE: boggle_benchmark.py
+# WRITER: Daniel Sinai
+# DESCRIPTION: This program measures the dictionary and solver hot
+#              paths of the boggle game on seeded boards
+###################################################################
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import boggle_board_randomizer as bbr
+import boggle_utils as utils
+import dictionary_cache
+import numpy_board
+from board import Board, FILE_PATH
+
+DEFAULT_BOARDS = 20
+DEFAULT_REPEAT = 3
+DEFAULT_SEED = 0
+DEFAULT_THRESHOLD = 0.10
+PATH_LENGTHS = (3, 4, 5)
+WORD_LENGTHS = (3, 4, 5, 6)
+
+
+def seeded_boards(count, seed):
+    """
+    This function creates the same random boards for every run
+    :param count: Integer - number of boards
+    :param seed: Integer - random seed
+    :return: List of lists of lists - boards
+    """
+    state = random.getstate()
+    random.seed(seed)
+    boards = [bbr.randomize_board() for _ in range(count)]
+    random.setstate(state)
+    return boards
+
+
+def bench_init_words(boards, words):
+    """
+    This function loads the dictionary through Board.init_words without
+    the process-wide cache
+    :param boards: List of tuples - (board, paths of its words)
+    :param words: Trie - words from the dictionary
+    :return: Integer - number of operations
+    """
+    dictionary_cache.invalidate(FILE_PATH)
+    Board(bbr.BOARD_SIZE).init_words(FILE_PATH)
+    return 1
+
+
+def bench_load_text(boards, words):
+    """
+    This function parses the dictionary text file into a trie
+    :param boards: List of tuples - (board, paths of its words)
+    :param words: Trie - words from the dictionary
+    :return: Integer - number of operations
+    """
+    dictionary_cache.load_text(FILE_PATH)
+    return 1
+
+
+def bench_is_valid_path(boards, words):
+    """
+    This function validates the path of every word found on the boards
+    :param boards: List of tuples - (board, paths of its words)
+    :param words: Trie - words from the dictionary
+    :return: Integer - number of operations
+    """
+    operations = 0
+    for board, paths in boards:
+        for path in paths:
+            utils.is_valid_path(board, path, words)
+        operations += len(paths)
+    return operations
+
+
+def make_length_bench(function, n):
+    """
+    This function creates a benchmark of a search for a given length
+    :param function: Function - find_length_n_paths or find_length_n_words
+    :param n: Integer - length to search
+    :return: Function - the benchmark
+    """
+    def bench(boards, words):
+        for board, _ in boards:
+            function(n, board, words)
+        return len(boards)
+    return bench
+
+
+def bench_solve_board(boards, words):
+    """
+    This function solves every board
+    :param boards: List of tuples - (board, paths of its words)
+    :param words: Trie - words from the dictionary
+    :return: Integer - number of operations
+    """
+    for board, _ in boards:
+        utils.solve_board(board, words)
+    return len(boards)
+
+
+def bench_max_score_paths(boards, words):
+    """
+    This function finds the maximum score paths of every board
+    :param boards: List of tuples - (board, paths of its words)
+    :param words: Trie - words from the dictionary
+    :return: Integer - number of operations
+    """
+    for board, _ in boards:
+        utils.max_score_paths(board, words)
+    return len(boards)
+
+
+def bench_numpy_score_boards(boards, words):
+    """
+    This function scores all the boards together with the NumPy solver
+    :param boards: List of tuples - (board, paths of its words)
+    :param words: Trie - words from the dictionary
+    :return: Integer - number of operations
+    """
+    numpy_board.score_boards([board for board, _ in boards], words)
+    return len(boards)
+
+
+def get_cases():
+    """
+    This function returns the benchmarks to run
+    :return: List of tuples - (name, function)
+    """
+    cases = [("init_words", bench_init_words),
+             ("load_text", bench_load_text),
+             ("is_valid_path", bench_is_valid_path)]
+    for n in PATH_LENGTHS:
+        cases.append(("find_length_n_paths[%d]" % n,
+                      make_length_bench(utils.find_length_n_paths, n)))
+    for n in WORD_LENGTHS:
+        cases.append(("find_length_n_words[%d]" % n,
+                      make_length_bench(utils.find_length_n_words, n)))
+    cases.append(("solve_board", bench_solve_board))
+    cases.append(("max_score_paths", bench_max_score_paths))
+    if numpy_board.np is not None:
+        cases.append(("numpy_score_boards", bench_numpy_score_boards))
+    return cases
+
+
+def run_case(function, boards, words, repeat):
+    """
+    This function times a benchmark and measures its peak memory
+    :param function: Function - the benchmark
+    :param boards: List of tuples - (board, paths of its words)
+    :param words: Trie - words from the dictionary
+    :param repeat: Integer - number of timed runs, the best one is kept
+    :return: Dictionary - the measurements
+    """
+    tracemalloc.start()
+    function(boards, words)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    best = None
+    operations = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operations = function(boards, words)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return {"seconds": best, "operations": operations,
+            "ops_per_sec": operations / best if best else 0.0,
+            "peak_memory": peak}
+
+
+def get_commit():
+    """
+    This function returns the current git commit, if there is one
+    :return: String - commit hash, or None
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return
+
+
+def compare(results, baseline, threshold):
+    """
+    This function prints the change of every benchmark against older results
+    :param results: Dictionary - current results
+    :param baseline: Dictionary - older results
+    :param threshold: Float - slowdown ratio that counts as a regression
+    :return: List of strings - names of the regressed benchmarks
+    """
+    regressions = []
+    for name, current in results["cases"].items():
+        old = baseline["cases"].get(name)
+        if old is None or not old["ops_per_sec"]:
+            continue
+        ratio = current["ops_per_sec"] / old["ops_per_sec"]
+        mark = ""
+        if ratio < 1 - threshold:
+            regressions.append(name)
+            mark = "  REGRESSION"
+        print("%-26s %8.2fx%s" % (name, ratio, mark))
+    return regressions
+
+
+def main():
+    """
+    This function runs the benchmarks and prints their results
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description="Boggle benchmarks")
+    parser.add_argument("--boards", type=int, default=DEFAULT_BOARDS)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--filter", default="",
+                        help="run only benchmarks whose name contains this")
+    parser.add_argument("--output", help="save the results to a JSON file")
+    parser.add_argument("--compare", help="JSON results to compare with")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    words = Board(bbr.BOARD_SIZE).get_words_list()
+    boards = [(board, list(utils.solve_board(board, words).values()))
+              for board in seeded_boards(args.boards, args.seed)]
+    results = {"commit": get_commit(), "python": platform.python_version(),
+               "boards": args.boards, "seed": args.seed, "cases": {}}
+    print("%-26s %12s %14s %12s" % ("benchmark", "seconds", "ops/sec",
+                                    "peak KB"))
+    for name, function in get_cases():
+        if args.filter not in name:
+            continue
+        case = run_case(function, boards, words, args.repeat)
+        results["cases"][name] = case
+        print("%-26s %12.6f %14.1f %12.1f" % (name, case["seconds"],
+                                              case["ops_per_sec"],
+                                              case["peak_memory"] / 1024))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -20,15 +20,119 @@ LETTERS = [
     ['N', 'U', 'I', 'H', 'M', 'QU']
 ]
 
+# Big Boggle, 5x5
+BIG_BOGGLE_LETTERS = [
+    ['A', 'A', 'A', 'F', 'R', 'S'],
+    ['A', 'A', 'E', 'E', 'E', 'E'],
+    ['A', 'A', 'F', 'I', 'R', 'S'],
+    ['A', 'D', 'E', 'N', 'N', 'N'],
+    ['A', 'E', 'E', 'E', 'E', 'M'],
+    ['A', 'E', 'E', 'G', 'M', 'U'],
+    ['A', 'E', 'G', 'M', 'N', 'N'],
+    ['A', 'F', 'I', 'R', 'S', 'Y'],
+    ['B', 'J', 'K', 'QU', 'X', 'Z'],
+    ['C', 'C', 'E', 'N', 'S', 'T'],
+    ['C', 'E', 'I', 'I', 'L', 'T'],
+    ['C', 'E', 'I', 'L', 'P', 'T'],
+    ['C', 'E', 'I', 'P', 'S', 'T'],
+    ['D', 'D', 'H', 'N', 'O', 'T'],
+    ['D', 'H', 'H', 'L', 'O', 'R'],
+    ['D', 'H', 'L', 'N', 'O', 'R'],
+    ['D', 'H', 'L', 'N', 'O', 'R'],
+    ['E', 'I', 'I', 'I', 'T', 'T'],
+    ['E', 'M', 'O', 'T', 'T', 'T'],
+    ['E', 'N', 'S', 'S', 'S', 'U'],
+    ['F', 'I', 'P', 'R', 'S', 'Y'],
+    ['G', 'O', 'R', 'R', 'V', 'W'],
+    ['I', 'P', 'R', 'R', 'R', 'Y'],
+    ['N', 'O', 'O', 'T', 'U', 'W'],
+    ['O', 'O', 'O', 'T', 'T', 'U']
+]
+
+# Super Big Boggle, 6x6. The blank faces of its vowel die are left out
+SUPER_BIG_BOGGLE_LETTERS = [
+    ['A', 'A', 'A', 'F', 'R', 'S'],
+    ['A', 'A', 'E', 'E', 'E', 'E'],
+    ['A', 'A', 'E', 'E', 'O', 'O'],
+    ['A', 'A', 'F', 'I', 'R', 'S'],
+    ['A', 'B', 'D', 'E', 'I', 'O'],
+    ['A', 'D', 'E', 'N', 'N', 'N'],
+    ['A', 'E', 'E', 'E', 'E', 'M'],
+    ['A', 'E', 'E', 'G', 'M', 'U'],
+    ['A', 'E', 'G', 'M', 'N', 'N'],
+    ['A', 'E', 'I', 'L', 'M', 'N'],
+    ['A', 'E', 'I', 'N', 'O', 'U'],
+    ['A', 'F', 'I', 'R', 'S', 'Y'],
+    ['AN', 'ER', 'HE', 'IN', 'QU', 'TH'],
+    ['B', 'B', 'J', 'K', 'X', 'Z'],
+    ['C', 'C', 'E', 'N', 'S', 'T'],
+    ['C', 'D', 'D', 'L', 'N', 'N'],
+    ['C', 'E', 'I', 'I', 'T', 'T'],
+    ['C', 'E', 'I', 'P', 'S', 'T'],
+    ['C', 'F', 'G', 'N', 'U', 'Y'],
+    ['D', 'D', 'H', 'N', 'O', 'T'],
+    ['D', 'H', 'H', 'L', 'O', 'R'],
+    ['D', 'H', 'H', 'N', 'O', 'W'],
+    ['D', 'H', 'L', 'N', 'O', 'R'],
+    ['E', 'H', 'I', 'L', 'R', 'S'],
+    ['E', 'I', 'I', 'L', 'S', 'T'],
+    ['E', 'I', 'L', 'P', 'S', 'T'],
+    ['E', 'I', 'O'],
+    ['E', 'M', 'T', 'T', 'T', 'O'],
+    ['E', 'N', 'S', 'S', 'S', 'U'],
+    ['G', 'O', 'R', 'R', 'V', 'W'],
+    ['H', 'I', 'R', 'S', 'T', 'V'],
+    ['H', 'O', 'P', 'R', 'S', 'T'],
+    ['I', 'P', 'R', 'S', 'Y', 'Y'],
+    ['J', 'K', 'QU', 'W', 'X', 'Z'],
+    ['N', 'O', 'O', 'T', 'U', 'W'],
+    ['O', 'O', 'O', 'T', 'T', 'U']
+]
+
+DICE_SETS = [LETTERS, BIG_BOGGLE_LETTERS, SUPER_BIG_BOGGLE_LETTERS]
+
+
+def get_dice(rows, cols=None):
+    """
+    This function picks the dice set for a board size - the set with one die
+    per cube if there is one, otherwise the largest set, whose dice are then
+    used more than once
+    :param rows: Integer - number of rows
+    :param cols: Integer - number of columns, None for a square board
+    :return: List of lists of strings - dice
+    """
+    cubes = rows * (rows if cols is None else cols)
+    for dice_list in DICE_SETS:
+        if len(dice_list) == cubes:
+            return dice_list
+    return max(DICE_SETS, key=len)
+
+
+def get_board_dice(dice_list=LETTERS, rows=BOARD_SIZE, cols=None):
+    """
+    This function returns the dice that can land on a board - the dice set,
+    repeated as many times as randomize_board repeats it
+    :param dice_list: List of lists of strings - dice
+    :param rows: Integer - number of rows
+    :param cols: Integer - number of columns, None for a square board
+    :return: List of lists of strings - dice
+    """
+    if cols is None:
+        cols = rows
+    return dice_list * -(-rows * cols // len(dice_list))
+
 
-def randomize_board(dice_list=LETTERS):
-    dice_indices = list(range(len(dice_list)))
+def randomize_board(dice_list=LETTERS, rows=BOARD_SIZE, cols=None):
+    if cols is None:
+        cols = rows
+    copies = -(-rows * cols // len(dice_list))
+    dice_indices = list(range(len(dice_list))) * copies
     random.shuffle(dice_indices)
     dice_indices_iter = iter(dice_indices)
     board = []
-    for i in range(BOARD_SIZE):
+    for i in range(rows):
         row = []
-        for j in range(BOARD_SIZE):
+        for j in range(cols):
             die = dice_list[next(dice_indices_iter)]
             letter = random.choice(die)
             row.append(letter)
@@ -9,6 +9,17 @@ from tkinter import messagebox
 WOODEN_BOARD_PATH = "wooden_boggle_board.gif"
 TITLE = "Boggle Game"
 ALREADY_CHOSEN = "You have already chosen that word"
+LOADING_MSG = "Loading..."
+BUTTON_COLOR = '#c07202'
+DEAD_END_COLOR = '#8a7a66'
+DEFAULT_BOARD_SIZE = (4, 4)
+BUTTONS_X = (40, 136, 232, 328)
+BUTTONS_Y = (80, 174, 275, 370)
+BOARD_AREA_X = 40
+BOARD_AREA_Y = 80
+BOARD_AREA_WIDTH = 384
+BOARD_AREA_HEIGHT = 385
+BUTTON_GAP = 6
 
 
 class BoggleGUI:
@@ -16,12 +27,24 @@ class BoggleGUI:
     This class implements the GUI of the boggle game
     """
 
-    def __init__(self, button_names_list, cells_list, reset_game_func):
+    def __init__(self, button_names_list, cells_list, reset_game_func,
+                 add_cell_func=None, reset_word_func=None,
+                 start_game_func=None, type_word_func=None):
         """
-        This function initializes a new GUI object
+        This function initializes a new GUI object. The board may be left
+        empty and given later with set_board, so the window can be shown
+        while the board is still being loaded
         :param button_names_list: List of strings - letters for the board
         :param cells_list: List of tuples - board cells
         :param reset_game_func: Function to reset the game if necessary
+        :param add_cell_func: Function called with every cell the player
+        adds to the current word, or None
+        :param reset_word_func: Function called when the current word is
+        reset, or None
+        :param start_game_func: Function called when the player starts the
+        game, which keeps the clock from then on, or None
+        :param type_word_func: Function called with every word the player
+        types and enters, or None
         """
         self.current_word = ''
         self.button_names_list = button_names_list
@@ -33,10 +56,15 @@ class BoggleGUI:
         self.__current_word_path = []
         self.current_score = 0
         self.reset_game_func = reset_game_func
+        self.add_cell_func = add_cell_func
+        self.reset_word_func = reset_word_func
+        self.start_game_func = start_game_func
+        self.type_word_func = type_word_func
         self.background_image = tk.PhotoImage(file=WOODEN_BOARD_PATH)
 
         self.__buttons_list = \
-            [self.__create_single_button(self.root, "", "") for _ in range(16)]
+            [self.__create_single_button(self.root, "", "")
+             for _ in self.locations_list]
 
         self.__board_canvas = tk.Canvas(self.root, width=650, height=500)
         self.__board_canvas.pack()
@@ -44,7 +72,6 @@ class BoggleGUI:
 
         self.__mins = tk.StringVar()
         self.__sec = tk.StringVar()
-        self.__total_time = 0
         self.__score_var = tk.StringVar()
         self.__words_found_var = tk.StringVar()
 
@@ -56,6 +83,10 @@ class BoggleGUI:
         self.__init_check_word_button()
         self.__init_reset_word_button()
         self.__init_current_word_label()
+        self.__init_word_entry()
+        self.__init_loading_label()
+        if not self.locations_list:
+            self.show_loading(True)
 
         self.root.protocol('WM_DELETE_WINDOW', self.__on_close)
 
@@ -68,6 +99,44 @@ class BoggleGUI:
                                            image=self.background_image)
         self.__background_label.place(x=0, y=50)
 
+    def __init_loading_label(self):
+        """
+        This function creates the label shown while the board is loading
+        :return: None
+        """
+        self.__loading_label = tk.Label(self.root, text=LOADING_MSG,
+                                        font="Helvetica 16 bold")
+
+    def show_loading(self, loading):
+        """
+        This function shows or hides the loading state. The game can not be
+        started, and no word can be checked or reset, while loading
+        :param loading: Boolean - True while the board is loading
+        :return: None
+        """
+        buttons = (self.__start_game_button, self.check_word_button,
+                   self.__reset_word_button)
+        if loading:
+            self.__loading_label.place(x=170, y=250)
+            [self.__make_disabled(button) for button in buttons]
+        else:
+            self.__loading_label.place_forget()
+            [self.__make_enabled(button) for button in buttons]
+
+    def set_board(self, button_names_list, cells_list):
+        """
+        This function sets the board of the game and ends the loading state
+        :param button_names_list: List of strings - letters for the board
+        :param cells_list: List of tuples - board cells
+        :return: None
+        """
+        self.button_names_list = button_names_list
+        self.locations_list = cells_list
+        self.__buttons_list = \
+            [self.__create_single_button(self.root, "", "")
+             for _ in self.locations_list]
+        self.show_loading(False)
+
     def __init_current_word_label(self):
         """
         This function creates the current word label
@@ -80,6 +149,29 @@ class BoggleGUI:
         self._current_word_label = tk.Label(self.root, text=self.current_word)
         self._current_word_label.place(x=508, y=220)
 
+    def __init_word_entry(self):
+        """
+        This function creates the entry where the player can type a word
+        and submit it with Enter. It is enabled once the game starts
+        :return: None
+        """
+        self.__word_entry = tk.Entry(self.root, width=14,
+                                     font="Helvetica 12 bold",
+                                     state='disabled')
+        self.__word_entry.bind("<Return>", self.__enter_word)
+        self.__word_entry.place(x=330, y=14)
+
+    def __enter_word(self, event):
+        """
+        This function handles an event where the player enters a typed word
+        :param event: Object
+        :return: None
+        """
+        word = self.__word_entry.get()
+        self.__word_entry.delete(0, tk.END)
+        if word.strip() and self.type_word_func:
+            self.type_word_func(word)
+
     def __init_reset_word_button(self):
         """
         This function creates the "reset word" button
@@ -106,11 +198,14 @@ class BoggleGUI:
         This function creates the "start game" button
         :return: None
         """
-        self.__game_start = lambda: [self.__countdown_timer(),
+        self.__game_start = lambda: [self.__make_disabled(
+                                         self.__start_game_button),
                                      self.__create_buttons(
                                          self.root, self.button_names_list),
-                                     self.root.after(181000,
-                                                     self.reset_game_func)]
+                                     self.__make_enabled(self.__word_entry),
+                                     self.__word_entry.focus_set(),
+                                     self.start_game_func and
+                                     self.start_game_func()]
 
         self.__start_game_button = tk.Button(self.root, text="Start The Game",
                                              font="Helvetica 10 bold",
@@ -194,7 +289,9 @@ class BoggleGUI:
         self.current_word = ''
         self.__current_word_path = []
         self._current_word_label.config(text='')
-        [self.__make_enabled(self.__buttons_list[i]) for i in range(16)]
+        [self.__make_enabled(button) for button in self.__buttons_list]
+        if self.reset_word_func:
+            self.reset_word_func()
 
     def __add_click_to_word(self, letter):
         """
@@ -239,20 +336,15 @@ class BoggleGUI:
         """
         self.__score_var.set("Score: " + str(self.current_score))
 
-    def __countdown_timer(self):
+    def show_time(self, seconds):
         """
-        This function creates a countdown timer for the game
+        This function shows the time left on the timer
+        :param seconds: Integer - seconds left
         :return: None
         """
-        self.__make_disabled(self.__start_game_button)
-        self.__total_time = int(self.__mins.get()) * 60 + int(self.__sec.get())
-        if self.__total_time > 0:
-            self.__total_time -= 1
-            minute, second = divmod(self.__total_time, 60)
-            self.__sec.set(str(second))
-            self.__mins.set(str(minute))
-            self.root.update()
-            self.root.after(1000, self.__countdown_timer)
+        minute, second = divmod(seconds, 60)
+        self.__mins.set("%02d" % minute)
+        self.__sec.set("%02d" % second)
 
     def __create_single_button(self, root, bt_text, cmd):
         """
@@ -263,7 +355,7 @@ class BoggleGUI:
         :return: Tkinter button
         """
         return tk.Button(root, text=bt_text, height=5, width=11,
-                         command=cmd, bg='#c07202', fg='white',
+                         command=cmd, bg=BUTTON_COLOR, fg='white',
                          disabledforeground='blue', font=('Lucida Grande', 9,
                                                           'bold'))
 
@@ -291,157 +383,58 @@ class BoggleGUI:
         :return: None
         """
         self.__current_word_path.append(self.locations_list[i])
+        if self.add_cell_func:
+            self.add_cell_func(self.locations_list[i])
+
+    def show_dead_ends(self, next_cells):
+        """
+        This function greys out the letters that can not continue the
+        current word
+        :param next_cells: Collection of tuples - cells that continue the word
+        :return: None
+        """
+        for i, cell in enumerate(self.locations_list):
+            if cell in next_cells:
+                self.__buttons_list[i]['bg'] = BUTTON_COLOR
+            else:
+                self.__buttons_list[i]['bg'] = DEAD_END_COLOR
 
     def __create_buttons(self, root, button_text_lst):
         """
-        This function creates the letters buttons for the game
+        This function creates the letters buttons for the game. A 4x4 board
+        keeps its original places, larger boards are spread over the same
+        area with smaller buttons
         :param root: Tkinter root
         :param button_text_lst: List of string - letters
         :return: None
         """
-        button1_actions = lambda: [self.__add_click_to_word(button_text_lst[0]),
-                                   self.__make_disabled(self.__buttons_list[0]),
-                                   self.add_to_location_list(0)]
-
-        self.__buttons_list[0] = self.__create_single_button(root,
-                                                             button_text_lst[0],
-                                                             button1_actions)
-        self.__buttons_list[0].place(x=40, y=80)
-
-        button2_actions = lambda: [self.__add_click_to_word(button_text_lst[1]),
-                                   self.__make_disabled(self.__buttons_list[1]),
-                                   self.add_to_location_list(1)]
-
-        self.__buttons_list[1] = self.__create_single_button(root,
-                                                             button_text_lst[1],
-                                                             button2_actions)
-        self.__buttons_list[1].place(x=136, y=80)
-
-        button3_actions = lambda: [self.__add_click_to_word(button_text_lst[2]),
-                                   self.__make_disabled(self.__buttons_list[2]),
-                                   self.add_to_location_list(2)]
-
-        self.__buttons_list[2] = self.__create_single_button(root,
-                                                             button_text_lst[2],
-                                                             button3_actions)
-        self.__buttons_list[2].place(x=232, y=80)
-
-        button4_actions = lambda: [self.__add_click_to_word(button_text_lst[3]),
-                                   self.__make_disabled(self.__buttons_list[3]),
-                                   self.add_to_location_list(3)]
-
-        self.__buttons_list[3] = self.__create_single_button(root,
-                                                             button_text_lst[3],
-                                                             button4_actions)
-        self.__buttons_list[3].place(x=328, y=80)
-
-        button5_actions = lambda: [self.__add_click_to_word(button_text_lst[4]),
-                                   self.__make_disabled(self.__buttons_list[4]),
-                                   self.add_to_location_list(4)]
-
-        self.__buttons_list[4] = self.__create_single_button(root,
-                                                             button_text_lst[4],
-                                                             button5_actions)
-        self.__buttons_list[4].place(x=40, y=174)
-
-        button6_actions = lambda: [self.__add_click_to_word(button_text_lst[5]),
-                                   self.__make_disabled(self.__buttons_list[5]),
-                                   self.add_to_location_list(5)]
-
-        self.__buttons_list[5] = self.__create_single_button(root,
-                                                             button_text_lst[5],
-                                                             button6_actions)
-        self.__buttons_list[5].place(x=136, y=174)
-
-        button7_actions = lambda: [self.__add_click_to_word(button_text_lst[6]),
-                                   self.__make_disabled(self.__buttons_list[6]),
-                                   self.add_to_location_list(6)]
-
-        self.__buttons_list[6] = self.__create_single_button(root,
-                                                             button_text_lst[6],
-                                                             button7_actions)
-        self.__buttons_list[6].place(x=232, y=174)
-
-        button8_actions = lambda: [self.__add_click_to_word(button_text_lst[7]),
-                                   self.__make_disabled(self.__buttons_list[7]),
-                                   self.add_to_location_list(7)]
-
-        self.__buttons_list[7] = self.__create_single_button(root,
-                                                             button_text_lst[7],
-                                                             button8_actions)
-        self.__buttons_list[7].place(x=328, y=174)
-
-        button9_actions = lambda: [self.__add_click_to_word(button_text_lst[8]),
-                                   self.__make_disabled(self.__buttons_list[8]),
-                                   self.add_to_location_list(8)]
-
-        self.__buttons_list[8] = self.__create_single_button(root,
-                                                             button_text_lst[8],
-                                                             button9_actions)
-        self.__buttons_list[8].place(x=40, y=275)
-
-        button10_actions = lambda: [self.__add_click_to_word(button_text_lst[9]),
-                                    self.__make_disabled(self.__buttons_list[9]),
-                                    self.add_to_location_list(9)]
-
-        self.__buttons_list[9] = self.__create_single_button(root,
-                                                             button_text_lst[9],
-                                                             button10_actions)
-        self.__buttons_list[9].place(x=136, y=275)
-
-        button11_actions = lambda: [self.__add_click_to_word(button_text_lst[10]),
-                                    self.__make_disabled(self.__buttons_list[10]),
-                                    self.add_to_location_list(10)]
-
-        self.__buttons_list[10] = self.__create_single_button(root,
-                                                              button_text_lst[10],
-                                                              button11_actions)
-        self.__buttons_list[10].place(x=232, y=275)
-
-        button12_actions = lambda: [self.__add_click_to_word(button_text_lst[11]),
-                                    self.__make_disabled(self.__buttons_list[11]),
-                                    self.add_to_location_list(11)]
-
-        self.__buttons_list[11] = self.__create_single_button(root,
-                                                              button_text_lst[11],
-                                                              button12_actions)
-        self.__buttons_list[11].place(x=328, y=275)
-
-        button13_actions = lambda: [self.__add_click_to_word(button_text_lst[12]),
-                                    self.__make_disabled(self.__buttons_list[12]),
-                                    self.add_to_location_list(12)]
-
-        self.__buttons_list[12] = self.__create_single_button(root,
-                                                              button_text_lst[12],
-                                                              button13_actions)
-        self.__buttons_list[12].place(x=40, y=370)
-
-        button14_actions = lambda: [self.__add_click_to_word(button_text_lst[13]),
-                                    self.__make_disabled(self.__buttons_list[13]),
-                                    self.add_to_location_list(13)]
-
-        self.__buttons_list[13] = self.__create_single_button(root,
-                                                              button_text_lst[13],
-                                                              button14_actions)
-        self.__buttons_list[13].place(x=136, y=370)
-
-        button15_actions = lambda: [self.__add_click_to_word(button_text_lst[14]),
-                                    self.__make_disabled(self.__buttons_list[14]),
-                                    self.add_to_location_list(14)]
-
-        self.__buttons_list[14] = self.__create_single_button(root,
-                                                              button_text_lst[14],
-                                                              button15_actions)
-        self.__buttons_list[14].place(x=232, y=370)
-
-        button16_actions = lambda: [self.__add_click_to_word(button_text_lst[15]),
-                                    self.__make_disabled(self.__buttons_list[15]),
-                                    self.add_to_location_list(15)]
-
-        self.__buttons_list[15] = self.__create_single_button(root,
-                                                              button_text_lst[15],
-                                                              button16_actions)
-        self.__buttons_list[15].place(x=328, y=370)
+        rows = max(row for row, _ in self.locations_list) + 1
+        cols = max(col for _, col in self.locations_list) + 1
+        for i, (row, col) in enumerate(self.locations_list):
+            self.__buttons_list[i] = self.__create_single_button(
+                root, button_text_lst[i],
+                self.__make_button_actions(i, button_text_lst[i]))
+            if (rows, cols) == DEFAULT_BOARD_SIZE:
+                self.__buttons_list[i].place(x=BUTTONS_X[col],
+                                             y=BUTTONS_Y[row])
+            else:
+                width = BOARD_AREA_WIDTH // cols
+                height = BOARD_AREA_HEIGHT // rows
+                self.__buttons_list[i].place(x=BOARD_AREA_X + col * width,
+                                             y=BOARD_AREA_Y + row * height,
+                                             width=width - BUTTON_GAP,
+                                             height=height - BUTTON_GAP)
+
+    def __make_button_actions(self, i, letter):
+        """
+        This function creates the command of a letter button
+        :param i: Integer - index of the button
+        :param letter: String - letter of the button
+        :return: Function - the command
+        """
+        return lambda: [self.__add_click_to_word(letter),
+                        self.__make_disabled(self.__buttons_list[i]),
+                        self.add_to_location_list(i)]
 
     def update_words_found_list(self, word):
         """
@@ -0,0 +1,314 @@
+###################################################################
+# FILE: boggle_server.py
+# WRITER: Daniel Sinai
+# DESCRIPTION: This program serves many headless boggle games over
+#              JSON lines, on stdin/stdout or a unix socket
+###################################################################
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+
+import boggle_board_randomizer as bbr
+from game import Game
+
+SWEEP_INTERVAL = 30
+SESSION_GRACE = 60
+MAX_LINE = 1 << 20
+
+
+async def skip_line(reader):
+    """
+    This function drops the rest of a line that is too long to be read
+    :param reader: asyncio.StreamReader
+    :return: None
+    """
+    while True:
+        try:
+            await reader.readuntil(b"\n")
+            return
+        except asyncio.IncompleteReadError:
+            return
+        except asyncio.LimitOverrunError as e:
+            await reader.readexactly(e.consumed)
+
+
+class GameServer:
+    """
+    This class hosts many games at once. Every game is a session created on
+    request, and all the sessions share the process' single copy of the
+    dictionary. A request is a JSON object with an "op":
+    "new" - start a game, the reply has its "session" and "board"
+    "submit" - submit a "path" of [row, col] cells, or a typed "word", to
+    a "session"
+    "status" - the score, words found and time left of a "session"
+    "end" - end a "session", the reply also has the number of words that
+    were missed
+    The reply repeats the request's "id", if it has one, and has an "error"
+    if the request failed
+    """
+    def __init__(self, rows=bbr.BOARD_SIZE, cols=None, max_sessions=None):
+        """
+        This function initializes a new instance
+        :param rows: Integer - number of rows of the boards
+        :param cols: Integer - number of columns, None for square boards
+        :param max_sessions: Integer - most sessions at once, None for no
+        limit
+        """
+        self.__rows = rows
+        self.__cols = cols
+        self.__max_sessions = max_sessions
+        self.__sessions = {}
+        self.__session_ids = itertools.count(1)
+        self.__handlers = {"new": self.__new_session,
+                           "submit": self.__submit,
+                           "status": self.__status,
+                           "end": self.__end_session}
+
+    def warm_up(self):
+        """
+        This function loads the dictionary of the server's board size, so
+        the first new session does not build it on the event loop and hold
+        up every other session
+        :return: None
+        """
+        Game(self.__rows, self.__cols, solve_in_background=False)
+
+    def get_session_count(self):
+        """
+        This function returns the number of open sessions
+        :return: Integer
+        """
+        return len(self.__sessions)
+
+    async def handle_request(self, request):
+        """
+        This function handles a single request
+        :param request: Dictionary - the request
+        :return: Dictionary - the reply
+        """
+        op = request.get("op")
+        handler = self.__handlers.get(op) if isinstance(op, str) else None
+        if handler is None:
+            reply = {"error": "unknown op"}
+        else:
+            try:
+                reply = await handler(request)
+            except (KeyError, TypeError, ValueError) as e:
+                reply = {"error": "bad request: %s" % e}
+        if "id" in request:
+            reply["id"] = request["id"]
+        return reply
+
+    def __get_game(self, request):
+        """
+        This function returns the game of a request's session
+        :param request: Dictionary - the request
+        :return: Game object
+        """
+        game = self.__sessions.get(request["session"])
+        if game is None:
+            raise ValueError("no session %r" % request["session"])
+        return game
+
+    async def __new_session(self, request):
+        """
+        This function starts a new game
+        :param request: Dictionary - the request
+        :return: Dictionary - the reply
+        """
+        if self.__max_sessions is not None and \
+                len(self.__sessions) >= self.__max_sessions:
+            return {"error": "too many sessions"}
+        game = Game(self.__rows, self.__cols, solve_in_background=False)
+        game.start_timer()
+        session = next(self.__session_ids)
+        self.__sessions[session] = game
+        return {"session": session, "board": game.get_board_as_list(),
+                "seconds": game.get_timer().get_seconds_left()}
+
+    async def __submit(self, request):
+        """
+        This function submits a path or a typed word to a game
+        :param request: Dictionary - the request
+        :return: Dictionary - the reply, with the word, the score it got and
+        the total score
+        """
+        game = self.__get_game(request)
+        if game.get_timer().is_over():
+            return {"error": "time is over", "score": game.get_score()}
+        if "word" in request:
+            word, score = game.submit_word(request["word"])
+        else:
+            word, score = game.submit_path([tuple(cell)
+                                            for cell in request["path"]])
+        return {"word": word, "points": score, "score": game.get_score()}
+
+    async def __status(self, request):
+        """
+        This function reports the state of a game
+        :param request: Dictionary - the request
+        :return: Dictionary - the reply
+        """
+        game = self.__get_game(request)
+        return {"score": game.get_score(), "words": game.get_words_found(),
+                "seconds": game.get_timer().get_seconds_left()}
+
+    async def __end_session(self, request):
+        """
+        This function ends a game. Its words are found in a worker thread,
+        so the other sessions are not held up
+        :param request: Dictionary - the request
+        :return: Dictionary - the reply
+        """
+        game = self.__sessions.pop(request["session"], None)
+        if game is None:
+            raise ValueError("no session %r" % request["session"])
+        words_found = game.get_words_found()
+        missed = await asyncio.get_running_loop().run_in_executor(
+            None, game.get_words_remaining, words_found)
+        return {"score": game.get_score(), "words": words_found,
+                "missed": missed}
+
+    async def sweep(self, interval=SWEEP_INTERVAL, grace=SESSION_GRACE):
+        """
+        This function keeps closing the sessions whose time has been over
+        for a while
+        :param interval: Float - seconds between two sweeps
+        :param grace: Float - seconds a finished session is kept
+        :return: None
+        """
+        while True:
+            await asyncio.sleep(interval)
+            for session, game in list(self.__sessions.items()):
+                if game.get_timer().get_time_since_end() >= grace:
+                    del self.__sessions[session]
+
+    async def serve_lines(self, reader, write, drain=None):
+        """
+        This function answers JSON-lines requests until the input ends. A
+        request that fails, or is longer than MAX_LINE, gets an error reply,
+        and the next requests are still answered
+        :param reader: asyncio.StreamReader - requests, one per line
+        :param write: Function - writes a reply line
+        :param drain: Coroutine function that waits until the replies are
+        sent, or None
+        :return: None
+        """
+        while True:
+            try:
+                line = await reader.readuntil(b"\n")
+            except asyncio.IncompleteReadError as e:
+                line = e.partial
+            except asyncio.LimitOverrunError:
+                await skip_line(reader)
+                line = None
+            if line is None:
+                reply = {"error": "request longer than %d bytes" % MAX_LINE}
+            elif not line:
+                break
+            elif not line.strip():
+                continue
+            else:
+                reply = await self.__answer(line)
+            write(json.dumps(reply) + "\n")
+            if drain is not None:
+                await drain()
+
+    async def __answer(self, line):
+        """
+        This function answers a single request line
+        :param line: Bytes - the request, as JSON
+        :return: Dictionary - the reply
+        """
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return {"error": "invalid JSON"}
+        if not isinstance(request, dict):
+            return {"error": "a request must be an object"}
+        try:
+            return await self.handle_request(request)
+        except Exception as e:
+            return {"error": "failed: %s" % e}
+
+    async def handle_connection(self, reader, writer):
+        """
+        This function serves a single socket connection
+        :param reader: asyncio.StreamReader
+        :param writer: asyncio.StreamWriter
+        :return: None
+        """
+        try:
+            await self.serve_lines(
+                reader, lambda line: writer.write(line.encode()),
+                writer.drain)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve_unix(self, path):
+        """
+        This function serves requests on a unix socket until cancelled
+        :param path: String - path of the socket
+        :return: None
+        """
+        server = await asyncio.start_unix_server(self.handle_connection,
+                                                 path, limit=MAX_LINE)
+        sweeper = asyncio.ensure_future(self.sweep())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            sweeper.cancel()
+
+    async def serve_stdio(self):
+        """
+        This function serves requests from stdin, writing the replies to
+        stdout, until stdin ends
+        :return: None
+        """
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=MAX_LINE)
+        await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+        def write(line):
+            sys.stdout.write(line)
+            sys.stdout.flush()
+        sweeper = asyncio.ensure_future(self.sweep())
+        try:
+            await self.serve_lines(reader, write)
+        finally:
+            sweeper.cancel()
+
+
+def main():
+    """
+    This function runs the server
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description="Headless boggle server")
+    parser.add_argument("--socket",
+                        help="unix socket to listen on, stdin/stdout if "
+                             "not given")
+    parser.add_argument("--rows", type=int, default=bbr.BOARD_SIZE)
+    parser.add_argument("--cols", type=int)
+    parser.add_argument("--max-sessions", type=int)
+    args = parser.parse_args()
+
+    server = GameServer(args.rows, args.cols, args.max_sessions)
+    server.warm_up()
+    try:
+        if args.socket:
+            asyncio.run(server.serve_unix(args.socket))
+        else:
+            asyncio.run(server.serve_stdio())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,52 @@
 # DESCRIPTION: This program implements various logical functions
 #              for the boggle game
 ###################################################################
+import time
+from functools import lru_cache
+
+import letter_filter
+from trie import Trie
+
+CHECK_INTERVAL = 256
+
+
+@lru_cache(maxsize=None)
+def board_geometry(rows, cols):
+    """
+    This function builds the lookup tables of a board size. Cells are
+    numbered row by row, so cell (i, j) is index i * cols + j
+    :param rows: Integer - number of rows
+    :param cols: Integer - number of columns
+    :return: Tuple - (tuple of cells, dictionary of cell to index, tuple of
+    the neighbors indices of every index)
+    """
+    cells = tuple((i, j) for i in range(rows) for j in range(cols))
+    indices = {cell: index for index, cell in enumerate(cells)}
+    neighbors = tuple(
+        tuple(i * cols + j
+              for i in range(max(row - 1, 0), min(row + 2, rows))
+              for j in range(max(col - 1, 0), min(col + 2, cols))
+              if (i, j) != (row, col))
+        for row, col in cells)
+    return cells, indices, neighbors
+
+
+def get_geometry(board):
+    """
+    This function returns the lookup tables of a board's size
+    :param board: List of lists - board
+    :return: Tuple - see board_geometry
+    """
+    return board_geometry(len(board), len(board[0]))
+
+
 def create_cells(board):
     """
     This function creates cells from a given board
     :param board: List of lists - board
     :return: List of tuples - board's cells
     """
-    return [(i, j) for i in range(len(board[0])) for j in range(len(board[0]))]
+    return list(get_geometry(board)[0])
 
 
 def valid_cells(board, row_location, col_location, size):
@@ -22,11 +61,14 @@ def valid_cells(board, row_location, col_location, size):
     :param size: Integer - radius
     :return: List of tuples - valid cells
     """
+    cells, indices, neighbors = get_geometry(board)
+    index = indices.get((row_location, col_location))
+    if size == 1 and index is not None:
+        return [cells[step] for step in neighbors[index]]
     result = []
-    board_cells = create_cells(board)
     for i in range(row_location - size, row_location + size + 1):
         for j in range(col_location - size, col_location + size + 1):
-            if (i, j) in board_cells and (i, j) != \
+            if (i, j) in indices and (i, j) != \
                     (row_location, col_location):
                 result.append((i, j))
     return result
@@ -38,20 +80,20 @@ def is_valid_path(board, path, words):
     dictionary
     :param board: List of lists - board
     :param path: List of tuples - path
-    :param words: List of string of words
+    :param words: Trie or list of strings - words from the dictionary
     :return: String - the word if the path is valid, else None
     """
     if path and len(path) == len(set(path)):
-        temp_location = path[0]
-        if temp_location in create_cells(board):
-            my_word = board[temp_location[0]][temp_location[1]]
+        cells, indices, neighbors = get_geometry(board)
+        temp_index = indices.get(path[0])
+        if temp_index is not None:
+            my_word = board[path[0][0]][path[0][1]]
             for location in path[1:]:
-                current_valid_cells = valid_cells(board, temp_location[0],
-                                                  temp_location[1], 1)
-                if location not in current_valid_cells:
+                index = indices.get(location)
+                if index not in neighbors[temp_index]:
                     return
-                temp_location = location
-                my_word += board[temp_location[0]][temp_location[1]]
+                temp_index = index
+                my_word += board[location[0]][location[1]]
             if my_word in words:
                 return my_word
     return
@@ -63,64 +105,232 @@ def find_length_n_paths(n, board, words):
     from the dictionary
     :param n: Integer number - path's length
     :param board: List of lists - board
-    :param words: List of strings - word from the dictionary
+    :param words: Trie or list of strings - words from the dictionary
+    :return: List of lists of tuples - paths
+    """
+    return search_paths(n, board, words, "paths")
+
+
+def find_length_n_words(n, board, words):
+    """
+    This function returns a list of all paths representing n-length words
+    from the dictionary
+    :param n: Integer number - word's length
+    :param board: List of lists - board
+    :param words: Trie or list of strings - words from the dictionary
+    :return: List of lists of tuples - paths
+    """
+    return search_paths(n, board, words, "words")
+
+
+def search_paths(n, board, words, flag):
+    """
+    This function runs the search of find_length_n_paths and
+    find_length_n_words. The visited cells are kept as a bitmask of cell
+    indices and the current path as one stack, so a path is copied only
+    when it is added to the results. With a trie the search also stops at
+    letters no word starts with
+    :param n: Integer number - path's length or word's length
+    :param board: List of lists - board
+    :param words: Trie or list of strings - words from the dictionary
+    :param flag: String - "paths" to count cells, "words" to count letters
     :return: List of lists of tuples - paths
     """
     final_list = []
-    for cell in create_cells(board):
-        find_length_n_paths_helper(n, board, words, final_list, [cell], cell,
-                                   1, "paths")
+    cells, indices, neighbors = get_geometry(board)
+    letters_list = [letters for row in board for letters in row]
+    trie = words if isinstance(words, Trie) else None
+    for index in range(len(cells)):
+        letters = letters_list[index]
+        node = None
+        if trie is not None:
+            node = trie.get_child(trie.get_root(), letters)
+            if node is None:
+                continue
+        find_length_n_paths_helper(n, words, trie, cells, neighbors,
+                                   letters_list, final_list, [index],
+                                   1 << index, letters, node,
+                                   1 if flag == "paths" else len(letters),
+                                   flag)
     return final_list
 
 
-def find_length_n_paths_helper(n, board, words, final_list, path_list, cell,
+def find_length_n_paths_helper(n, words, trie, cells, neighbors, letters_list,
+                               final_list, path_list, visited, word, node,
                                counter, flag):
     """
-    This function is a help function for find_length_n_paths
+    This function is a help function for search_paths
     :param n: Integer number
-    :param board: List of lists - board
-    :param words: List of strings - words from the dictionary
+    :param words: Trie or list of strings - words from the dictionary
+    :param trie: Trie - words as a trie, or None if words is not a trie
+    :param cells: Tuple of tuples - board cells by index
+    :param neighbors: Tuple of tuples - neighbors indices of every index
+    :param letters_list: List of strings - board letters by index
     :param final_list: List
-    :param path_list: List of tuples - path
-    :param cell: Tuple - single cell
+    :param path_list: List of integers - path indices, changed in place
+    :param visited: Integer - bitmask of the path indices
+    :param word: String - the letters of the path
+    :param node: Trie node of word, or None if words is not a trie
     :param counter: Integer number represents a counter
-    :param flag: Boolean
+    :param flag: String - "paths" or "words"
     :return: None
     """
     if counter > n:
         return
     if counter == n:
-        if is_valid_path(board, path_list, words):
-            final_list.append(path_list)
+        if trie.is_word(node) if trie is not None else word in words:
+            final_list.append([cells[index] for index in path_list])
         return
 
-    next_valid_steps = valid_cells(board, cell[0], cell[1], 1)
-    for step in next_valid_steps:
-        if step not in path_list:
-            if flag == "paths":
-                find_length_n_paths_helper(n, board, words, final_list,
-                                           path_list + [step], step,
-                                           counter + 1, flag)
-            elif flag == "words":
-                find_length_n_paths_helper(n, board, words, final_list,
-                                           path_list + [step], step, counter +
-                                           len(board[step[0]][step[1]]), flag)
+    for step in neighbors[path_list[-1]]:
+        if not visited >> step & 1:
+            letters = letters_list[step]
+            next_node = None
+            if trie is not None:
+                next_node = trie.get_child(node, letters)
+                if next_node is None:
+                    continue
+            path_list.append(step)
+            find_length_n_paths_helper(n, words, trie, cells, neighbors,
+                                       letters_list, final_list, path_list,
+                                       visited | 1 << step, word + letters,
+                                       next_node, counter + 1 if
+                                       flag == "paths" else
+                                       counter + len(letters), flag)
+            path_list.pop()
 
 
-def find_length_n_words(n, board, words):
+def iter_length_n_paths(n, board, words, limit=None, deadline=None,
+                        cancel_event=None):
     """
-    This function returns a list of all paths representing n-length words
-    from the dictionary
+    This function yields the n-length paths representing words from the
+    dictionary one by one, in the order of find_length_n_paths
+    :param n: Integer number - path's length
+    :param board: List of lists - board
+    :param words: Trie or list of strings - words from the dictionary
+    :param limit: Integer - stop after this many paths, None for no limit
+    :param deadline: Float - time.monotonic() time to stop at, or None
+    :param cancel_event: threading.Event - stop once it is set, or None
+    :return: Iterator of lists of tuples - paths
+    """
+    return iter_search_paths(n, board, words, "paths", limit, deadline,
+                             cancel_event)
+
+
+def iter_length_n_words(n, board, words, limit=None, deadline=None,
+                        cancel_event=None):
+    """
+    This function yields the paths representing n-length words from the
+    dictionary one by one, in the order of find_length_n_words
     :param n: Integer number - word's length
     :param board: List of lists - board
-    :param words: List of strings - words from the dictionary
-    :return: List of lists of tuples - paths
+    :param words: Trie or list of strings - words from the dictionary
+    :param limit: Integer - stop after this many paths, None for no limit
+    :param deadline: Float - time.monotonic() time to stop at, or None
+    :param cancel_event: threading.Event - stop once it is set, or None
+    :return: Iterator of lists of tuples - paths
     """
-    final_list = []
-    for cell in create_cells(board):
-        find_length_n_paths_helper(n, board, words, final_list, [cell], cell,
-                                   len(board[cell[0]][cell[1]]), "words")
-    return final_list
+    return iter_search_paths(n, board, words, "words", limit, deadline,
+                             cancel_event)
+
+
+def iter_search_paths(n, board, words, flag, limit=None, deadline=None,
+                      cancel_event=None):
+    """
+    This function searches the board depth first and yields every matching
+    path as soon as it is found. The visited cells are kept as a bitmask of
+    cell indices and the current path as one stack, so a path is copied
+    only when it is yielded. With a trie the search also stops at letters
+    no word starts with. The deadline and the cancel event are checked at
+    every start cell and every CHECK_INTERVAL steps. Closing the iterator
+    also cancels the search
+    :param n: Integer number - path's length or word's length
+    :param board: List of lists - board
+    :param words: Trie or list of strings - words from the dictionary
+    :param flag: String - "paths" to count cells, "words" to count letters
+    :param limit: Integer - stop after this many paths, None for no limit
+    :param deadline: Float - time.monotonic() time to stop at, or None
+    :param cancel_event: threading.Event - stop once it is set, or None
+    :return: Iterator of lists of tuples - paths
+    """
+    if limit is not None and limit <= 0:
+        return
+    cells, indices, neighbors = get_geometry(board)
+    letters_list = [letters for row in board for letters in row]
+    trie = words if isinstance(words, Trie) else None
+    watched = deadline is not None or cancel_event is not None
+    found = 0
+    steps = 0
+    for index in range(len(cells)):
+        if watched and is_stopped(deadline, cancel_event):
+            return
+        letters = letters_list[index]
+        node = None
+        if trie is not None:
+            node = trie.get_child(trie.get_root(), letters)
+            if node is None:
+                continue
+        counter = 1 if flag == "paths" else len(letters)
+        if counter >= n:
+            if counter == n and (trie.is_word(node) if trie is not None
+                                 else letters in words):
+                yield [cells[index]]
+                found += 1
+                if found == limit:
+                    return
+            continue
+
+        path_list = [index]
+        visited = 1 << index
+        stack = [(iter(neighbors[index]), letters, node, counter)]
+        while stack:
+            if watched:
+                steps += 1
+                if steps % CHECK_INTERVAL == 0 and \
+                        is_stopped(deadline, cancel_event):
+                    return
+            steps_iter, word, node, counter = stack[-1]
+            step = next(steps_iter, None)
+            if step is None:
+                stack.pop()
+                visited ^= 1 << path_list.pop()
+                continue
+            if visited >> step & 1:
+                continue
+            letters = letters_list[step]
+            next_counter = counter + 1 if flag == "paths" else \
+                counter + len(letters)
+            if next_counter > n:
+                continue
+            next_node = None
+            if trie is not None:
+                next_node = trie.get_child(node, letters)
+                if next_node is None:
+                    continue
+            if next_counter == n:
+                if trie.is_word(next_node) if trie is not None else \
+                        word + letters in words:
+                    yield [cells[i] for i in path_list] + [cells[step]]
+                    found += 1
+                    if found == limit:
+                        return
+                continue
+            path_list.append(step)
+            visited |= 1 << step
+            stack.append((iter(neighbors[step]), word + letters, next_node,
+                          next_counter))
+
+
+def is_stopped(deadline, cancel_event):
+    """
+    This function checks if a search should stop
+    :param deadline: Float - time.monotonic() time to stop at, or None
+    :param cancel_event: threading.Event - stop once it is set, or None
+    :return: Boolean
+    """
+    if cancel_event is not None and cancel_event.is_set():
+        return True
+    return deadline is not None and time.monotonic() >= deadline
 
 
 def max_score_paths(board, words):
@@ -128,18 +338,141 @@ def max_score_paths(board, words):
     This function returns a list of paths that provide the maximum game score
      for the board and word collection provided.
     :param board: List of lists - board
-    :param words: List of strings - words from the dictionary
-    :return:
+    :param words: Trie or list of strings - words from the dictionary
+    :return: List of lists of tuples - paths, shorter words first
+    """
+    return get_paths_by_length(solve_board(board, words))
+
+
+def get_paths_by_length(words_dict):
+    """
+    This function orders the paths of a solved board like max_score_paths,
+    shorter words first and words of the same length in the order they
+    were found
+    :param words_dict: Dictionary - word to its highest scoring path
+    :return: List of lists of tuples - paths
+    """
+    return [words_dict[word] for word in sorted(words_dict, key=len)]
+
+
+def solve_board(board, words):
+    """
+    This function finds every dictionary word on the board in a single pass.
+    A path is abandoned as soon as its letters stop being a prefix of a word
+    :param board: List of lists - board
+    :param words: Trie or list of strings - words from the dictionary
+    :return: Dictionary - word to its highest scoring path, in the order the
+    words were found
     """
+    trie = as_trie(words, board)
+    cells, indices, neighbors = get_geometry(board)
+    letters_list = [letters for row in board for letters in row]
     words_dict = {}
-    min_word_len = len(min(words, key=len))
-    max_word_len = len(max(words, key=len))
-    for n in range(min_word_len, max_word_len + 1):
-        current_n_words_list = find_length_n_words(n, board, words)
-        for path in current_n_words_list:
-            current_word = is_valid_path(board, path, words)
-            if current_word not in words_dict:
-                words_dict[current_word] = path
-            elif len(words_dict[current_word]) < len(path):
-                words_dict[current_word] = path
-    return list(words_dict.values())
+    for index in range(len(cells)):
+        letters = letters_list[index]
+        node = trie.get_child(trie.get_root(), letters)
+        if node is not None:
+            solve_board_helper(trie, cells, neighbors, letters_list,
+                               words_dict, [index], 1 << index, letters,
+                               node)
+    return words_dict
+
+
+def solve_board_helper(trie, cells, neighbors, letters_list, words_dict,
+                       path_list, visited, word, node):
+    """
+    This function is a help function for solve_board
+    :param trie: Trie - words from the dictionary
+    :param cells: Tuple of tuples - board cells by index
+    :param neighbors: Tuple of tuples - neighbors indices of every index
+    :param letters_list: List of strings - board letters by index
+    :param words_dict: Dictionary - word to its highest scoring path
+    :param path_list: List of integers - current path indices, changed in
+    place
+    :param visited: Integer - bitmask of the path indices
+    :param word: String - the letters of the current path
+    :param node: Trie node of word
+    :return: None
+    """
+    if trie.is_word(node):
+        if word not in words_dict or len(words_dict[word]) < len(path_list):
+            words_dict[word] = [cells[index] for index in path_list]
+    for step in neighbors[path_list[-1]]:
+        if not visited >> step & 1:
+            letters = letters_list[step]
+            next_node = trie.get_child(node, letters)
+            if next_node is not None:
+                path_list.append(step)
+                solve_board_helper(trie, cells, neighbors, letters_list,
+                                   words_dict, path_list,
+                                   visited | 1 << step, word + letters,
+                                   next_node)
+                path_list.pop()
+
+
+def find_word_path(board, word):
+    """
+    This function finds the highest scoring path that spells a given word.
+    Only cells whose letters continue the word are followed, so the search
+    never leaves the paths that spell it. A multi-letter cube such as 'QU'
+    has to match all of its letters
+    :param board: List of lists - board
+    :param word: String - word
+    :return: List of tuples - the longest path of the word, the first one
+    in search order if there are a few, or None if it is not on the board
+    """
+    cells, indices, neighbors = get_geometry(board)
+    letters_list = [letters for row in board for letters in row]
+    best = []
+    for index in range(len(cells)):
+        letters = letters_list[index]
+        if letters and word.startswith(letters):
+            find_word_path_helper(word, cells, neighbors, letters_list, best,
+                                  [index], 1 << index, len(letters))
+    return best[0] if best else None
+
+
+def find_word_path_helper(word, cells, neighbors, letters_list, best,
+                          path_list, visited, position):
+    """
+    This function is a help function for find_word_path
+    :param word: String - word
+    :param cells: Tuple of tuples - board cells by index
+    :param neighbors: Tuple of tuples - neighbors indices of every index
+    :param letters_list: List of strings - board letters by index
+    :param best: List - holds the longest path found so far
+    :param path_list: List of integers - current path indices, changed in
+    place
+    :param visited: Integer - bitmask of the path indices
+    :param position: Integer - number of letters of the word matched
+    :return: None
+    """
+    if position == len(word):
+        if not best or len(best[0]) < len(path_list):
+            best[:] = [[cells[index] for index in path_list]]
+        return
+    for step in neighbors[path_list[-1]]:
+        if not visited >> step & 1:
+            letters = letters_list[step]
+            if letters and word.startswith(letters, position):
+                path_list.append(step)
+                find_word_path_helper(word, cells, neighbors, letters_list,
+                                      best, path_list, visited | 1 << step,
+                                      position + len(letters))
+                path_list.pop()
+
+
+def as_trie(words, board=None):
+    """
+    This function returns the given words as a trie. If the words are not a
+    trie yet and a board is given, only the words whose letters fit the
+    board are put in the trie
+    :param words: Trie or iterable of strings - words
+    :param board: List of lists - board the trie is used for, or None
+    :return: Trie - words
+    """
+    if isinstance(words, Trie):
+        return words
+    if board is not None:
+        return letter_filter.board_dictionary(board, words)
+    return Trie(words)
@@ -0,0 +1,227 @@
+###################################################################
+# FILE: compiled_dictionary.py
+# WRITER: Daniel Sinai
+# DESCRIPTION: This program compiles a dictionary file into a binary
+#              trie and maps it back into memory, so processes can
+#              start without parsing the text file
+###################################################################
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from trie import Trie
+
+COMPILED_EXTENSION = ".dawg"
+MAGIC = b"BOGDAWG" + sys.byteorder[0].encode()
+HEADER = struct.Struct("<8sQQIIII")
+
+WORD_FLAG = 1
+COUNT_SHIFT = 1
+COUNT_MASK = 0x1F
+EDGES_SHIFT = 6
+LETTER_SHIFT = 24
+CHILD_MASK = 0xFFFFFF
+MAX_NODES = CHILD_MASK + 1
+MAX_EDGES = 1 << (32 - EDGES_SHIFT)
+MAX_DECODED = 4096
+
+
+class MappedTrie(Trie):
+    """
+    This class represents a trie that is read directly from a compiled
+    dictionary buffer. The buffer holds two arrays of unsigned 32 bit
+    integers - one entry per node:
+        first edge << 6 | number of children << 1 | is word
+    and one entry per edge, ordered by letter:
+        letter << 24 | child node
+    A node is its index in the nodes array and the root is node 0. Nodes are
+    decoded only when a search reaches them, and at most MAX_DECODED of them
+    are kept, so a long running process does not end up with a private copy
+    of the whole trie.
+    """
+    def __init__(self, buffer, word_count, node_count, edge_count,
+                 offset=0):
+        """
+        This function initializes a new instance
+        :param buffer: Bytes-like object - compiled dictionary, e.g. an mmap
+        :param word_count: Integer - number of words
+        :param node_count: Integer - number of nodes
+        :param edge_count: Integer - number of edges
+        :param offset: Integer - where the nodes array starts in the buffer
+        """
+        view = memoryview(buffer)
+        edges_offset = offset + node_count * 4
+        self.__nodes = view[offset:edges_offset].cast("I")
+        self.__edges = view[edges_offset:
+                            edges_offset + edge_count * 4].cast("I")
+        self.__size = word_count
+        self.__decoded = {}
+
+    def __decode(self, node):
+        """
+        This function reads the children of a node from the buffer
+        :param node: Integer - node
+        :return: Dictionary - letter to child node
+        """
+        entry = self.__nodes[node]
+        first = entry >> EDGES_SHIFT
+        children = {}
+        for index in range(first,
+                           first + ((entry >> COUNT_SHIFT) & COUNT_MASK)):
+            edge = self.__edges[index]
+            children[chr(edge >> LETTER_SHIFT)] = edge & CHILD_MASK
+        return children
+
+    def get_root(self):
+        """
+        This function returns the root node of the trie
+        :return: Integer - root node
+        """
+        return 0
+
+    def get_child(self, node, letters):
+        """
+        This function advances from a node along the given letters
+        :param node: Integer - node to start from
+        :param letters: String - one or more letters (e.g. a 'QU' cube)
+        :return: Integer - the node reached, or None if no word continues so
+        """
+        for letter in letters:
+            children = self.__decoded.get(node)
+            if children is None:
+                if len(self.__decoded) >= MAX_DECODED:
+                    self.__decoded.clear()
+                children = self.__decode(node)
+                self.__decoded[node] = children
+            node = children.get(letter)
+            if node is None:
+                return
+        return node
+
+    def is_word(self, node):
+        """
+        This function checks if a node ends a word
+        :param node: Integer - node
+        :return: Boolean
+        """
+        return bool(self.__nodes[node] & WORD_FLAG)
+
+    def get_node_key(self, node):
+        """
+        This function returns a hashable key that identifies a node
+        :param node: Integer - node
+        :return: Integer - the node itself
+        """
+        return node
+
+    def get_children(self, node):
+        """
+        This function returns the children of a node
+        :param node: Integer - node
+        :return: List of tuples - (letter, child node) in sorted order
+        """
+        return list(self.__decode(node).items())
+
+    def __len__(self):
+        """
+        This function returns the number of words in the trie
+        :return: Integer
+        """
+        return self.__size
+
+
+def get_compiled_path(file_path):
+    """
+    This function returns the path of a dictionary's compiled file
+    :param file_path: String - path to the dictionary file
+    :return: String - path to the compiled file
+    """
+    return os.path.splitext(file_path)[0] + COMPILED_EXTENSION
+
+
+def flatten(trie):
+    """
+    This function lays out a trie as nodes and edges arrays, numbering the
+    nodes in breadth first order. A trie with a node of more than 31
+    children, or with letters beyond one byte, can not be compiled
+    :param trie: Trie - words
+    :return: Tuple - (nodes array, edges array)
+    """
+    root = trie.get_root()
+    order = [root]
+    indices = {trie.get_node_key(root): 0}
+    nodes = array("I")
+    edges = array("I")
+    for node in order:
+        children = trie.get_children(node)
+        if len(children) > COUNT_MASK:
+            raise ValueError("A node with %d children can not be compiled"
+                             % len(children))
+        nodes.append(len(edges) << EDGES_SHIFT |
+                     len(children) << COUNT_SHIFT |
+                     (WORD_FLAG if trie.is_word(node) else 0))
+        for letter, child in children:
+            key = trie.get_node_key(child)
+            if key not in indices:
+                indices[key] = len(order)
+                order.append(child)
+            if ord(letter) > 0xFF:
+                raise ValueError("Letter %r can not be compiled" % letter)
+            edges.append(ord(letter) << LETTER_SHIFT | indices[key])
+        if len(order) > MAX_NODES or len(edges) > MAX_EDGES:
+            raise ValueError("Dictionary is too large to be compiled")
+    return nodes, edges
+
+
+def compile_dictionary(file_path, trie):
+    """
+    This function writes the compiled file of a dictionary
+    :param file_path: String - path to the dictionary file
+    :param trie: Trie - words of the dictionary file
+    :return: String - path to the compiled file
+    """
+    source = os.stat(file_path)
+    nodes, edges = flatten(trie)
+    compiled_path = get_compiled_path(file_path)
+    temp_path = "%s.%d.tmp" % (compiled_path, os.getpid())
+    with open(temp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, source.st_mtime_ns, source.st_size,
+                            len(trie), len(nodes), len(edges), 0))
+        nodes.tofile(f)
+        edges.tofile(f)
+    os.replace(temp_path, compiled_path)
+    return compiled_path
+
+
+def load_compiled(file_path):
+    """
+    This function maps the compiled file of a dictionary read-only into
+    memory, so all the processes that load it share the same pages
+    :param file_path: String - path to the dictionary file
+    :return: MappedTrie - words of the dictionary, or None if there is no
+    compiled file or it is older than the dictionary file
+    """
+    try:
+        source = os.stat(file_path)
+        with open(get_compiled_path(file_path), "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return
+    if len(buffer) < HEADER.size:
+        return
+    magic, modified, size, word_count, node_count, edge_count, _ = \
+        HEADER.unpack_from(buffer)
+    if magic != MAGIC or modified != source.st_mtime_ns or \
+            size != source.st_size or \
+            len(buffer) != HEADER.size + (node_count + edge_count) * 4:
+        return
+    return MappedTrie(buffer, word_count, node_count, edge_count, HEADER.size)
+
+
+if __name__ == "__main__":
+    import dictionary_cache
+
+    for path in sys.argv[1:] or ["boggle_dict.txt"]:
+        print(compile_dictionary(path, dictionary_cache.load_text(path)))
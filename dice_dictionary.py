@@ -0,0 +1,238 @@
+###################################################################
+# FILE: dice_dictionary.py
+# WRITER: Daniel Sinai
+# DESCRIPTION: This program narrows the dictionary down to the words
+#              a set of dice can ever spell, and caches the result
+#              next to the dictionary file
+###################################################################
+import hashlib
+import json
+import os
+
+import dictionary_cache
+
+REDUCED_SUFFIX = ".dice-%s.txt"
+HASH_LENGTH = 12
+
+
+def get_dice_hash(dice_list, cells=None):
+    """
+    This function hashes a set of dice and the number of cells they land
+    on. The order of the dice and of their faces does not change the hash
+    :param dice_list: List of lists of strings - dice
+    :param cells: Integer - number of cells of the board, None for one per
+    die
+    :return: String - hex digest
+    """
+    dice = sorted(sorted(die) for die in dice_list)
+    if cells is not None and cells < len(dice_list):
+        dice = [cells, dice]
+    return hashlib.sha1(json.dumps(dice).encode()).hexdigest()[:HASH_LENGTH]
+
+
+def get_reduced_path(file_path, dice_list, cells=None):
+    """
+    This function returns the path of a dictionary reduced to a dice set
+    :param file_path: String - path to the dictionary file
+    :param dice_list: List of lists of strings - dice
+    :param cells: Integer - number of cells of the board, None for one per
+    die
+    :return: String - path of the reduced dictionary file
+    """
+    return os.path.splitext(file_path)[0] + \
+        REDUCED_SUFFIX % get_dice_hash(dice_list, cells)
+
+
+class DiceSet:
+    """
+    This class checks which words a set of dice can spell at all, wherever
+    the dice land. A word can be spelled if it splits into faces, e.g.
+    'QU' + 'I' + 'T', and every face can be given a die of its own. A board
+    with fewer cells than dice holds only some of the dice, so a word can
+    have no more faces than the board has cells
+    """
+    def __init__(self, dice_list, cells=None):
+        """
+        This function initializes a new instance
+        :param dice_list: List of lists of strings - dice
+        :param cells: Integer - number of cells of the board, None for one
+        per die
+        """
+        self.__dice_of_face = {}
+        for die_index, die in enumerate(dice_list):
+            for face in set(die):
+                self.__dice_of_face.setdefault(face, []).append(die_index)
+        self.__faces_by_letter = {}
+        for face in self.__dice_of_face:
+            if face:
+                self.__faces_by_letter.setdefault(face[0], []).append(face)
+        self.__letters = set("".join(self.__dice_of_face))
+        self.__single_letters = {face for face in self.__dice_of_face
+                                 if len(face) == 1}
+        self.__multi_letter_starts = {face[0] for face in self.__dice_of_face
+                                      if len(face) > 1}
+        self.__assigned = {}
+        self.__dice_count = len(dice_list)
+        if cells is not None:
+            self.__dice_count = min(cells, self.__dice_count)
+        self.__options = {}
+        for face, dice in self.__dice_of_face.items():
+            mask = 0
+            for die_index in dice:
+                mask |= 1 << die_index
+            self.__options[face] = (len(dice), mask)
+        self.__max_length = sum(sorted((max(map(len, die), default=0)
+                                        for die in dice_list),
+                                       reverse=True)[:self.__dice_count])
+
+    def can_spell(self, word):
+        """
+        This function checks if the dice can spell a word
+        :param word: String - word
+        :return: Boolean
+        """
+        if len(word) > self.__max_length or \
+                not self.__letters.issuperset(word):
+            return False
+        if self.__single_letters.issuperset(word):
+            if self.__assign_dice(word):
+                return True
+            if self.__multi_letter_starts.isdisjoint(word):
+                return False
+        return any(self.__assign_dice(faces)
+                   for faces in self.__split(word, 0))
+
+    def __split(self, word, position):
+        """
+        This function lists the ways to split the rest of a word into faces
+        :param word: String - word
+        :param position: Integer - where the rest of the word starts
+        :return: Iterator of lists of strings - faces
+        """
+        if position == len(word):
+            yield []
+            return
+        for face in self.__faces_by_letter.get(word[position], ()):
+            if word.startswith(face, position):
+                for rest in self.__split(word, position + len(face)):
+                    yield [face] + rest
+
+    def __assign_dice(self, faces):
+        """
+        This function checks if every face can get a different die. The
+        faces with the fewest dice are given a die first, which almost
+        always works. Otherwise the faces are matched to dice with
+        augmenting paths, and the answer is kept for the next words with
+        the same faces
+        :param faces: Sequence of strings - faces
+        :return: Boolean
+        """
+        if len(faces) > self.__dice_count:
+            return False
+        available = -1
+        for _, mask in sorted(map(self.__options.__getitem__, faces)):
+            options = mask & available
+            if not options:
+                break
+            available ^= options & -options
+        else:
+            return True
+        key = tuple(sorted(faces))
+        assigned = self.__assigned.get(key)
+        if assigned is None:
+            assigned = self.__match(key)
+            self.__assigned[key] = assigned
+        return assigned
+
+    def __match(self, faces):
+        """
+        This function matches faces to different dice
+        :param faces: Tuple of strings - faces
+        :return: Boolean - True if every face got a die
+        """
+        face_of_die = {}
+
+        def assign(face_index, seen):
+            for die_index in self.__dice_of_face[faces[face_index]]:
+                if die_index in seen:
+                    continue
+                seen.add(die_index)
+                if die_index not in face_of_die or \
+                        assign(face_of_die[die_index], seen):
+                    face_of_die[die_index] = face_index
+                    return True
+            return False
+        return all(assign(face_index, set())
+                   for face_index in range(len(faces)))
+
+
+def reduce_words(words, dice_list, cells=None):
+    """
+    This function keeps the words a dice set can spell
+    :param words: Iterable of strings - words from the dictionary
+    :param dice_list: List of lists of strings - dice
+    :param cells: Integer - number of cells of the board, None for one per
+    die
+    :return: List of strings - words in their original order
+    """
+    dice_set = DiceSet(dice_list, cells)
+    return [word for word in words if dice_set.can_spell(word)]
+
+
+def build_reduced_dictionary(file_path, dice_list, cells=None):
+    """
+    This function writes the dictionary reduced to a dice set, unless it
+    was already written after the dictionary file last changed
+    :param file_path: String - path to the dictionary file
+    :param dice_list: List of lists of strings - dice
+    :param cells: Integer - number of cells of the board, None for one per
+    die
+    :return: String - path of the reduced dictionary file
+    """
+    reduced_path = get_reduced_path(file_path, dice_list, cells)
+    try:
+        if os.stat(reduced_path).st_mtime_ns >= \
+                os.stat(file_path).st_mtime_ns:
+            return reduced_path
+    except OSError:
+        pass
+    with open(file_path) as f:
+        words = reduce_words((word.strip() for word in f if word.strip()),
+                             dice_list, cells)
+    temp_path = "%s.%d.tmp" % (reduced_path, os.getpid())
+    with open(temp_path, "w") as f:
+        f.writelines(word + "\n" for word in words)
+    os.replace(temp_path, reduced_path)
+    return reduced_path
+
+
+def get_dictionary_path(file_path, dice_list, cells=None):
+    """
+    This function returns the path of the dictionary to use for a dice set -
+    the reduced dictionary, built if needed, or the dictionary itself if
+    the reduced one can not be written
+    :param file_path: String - path to the dictionary file
+    :param dice_list: List of lists of strings - dice
+    :param cells: Integer - number of cells of the board, None for one per
+    die
+    :return: String - path to a dictionary file
+    """
+    try:
+        return build_reduced_dictionary(file_path, dice_list, cells)
+    except OSError:
+        return file_path
+
+
+def get_dice_dictionary(file_path, dice_list, cells=None):
+    """
+    This function returns the words of a dictionary file that a dice set
+    can spell, as a trie shared by the whole process. The reduced word list
+    is built once and kept next to the dictionary file
+    :param file_path: String - path to the dictionary file
+    :param dice_list: List of lists of strings - dice
+    :param cells: Integer - number of cells of the board, None for one per
+    die
+    :return: Trie - the words the dice can spell
+    """
+    return dictionary_cache.get_dictionary(
+        get_dictionary_path(file_path, dice_list, cells))
@@ -0,0 +1,141 @@
+###################################################################
+# FILE: dictionary_cache.py
+# WRITER: Daniel Sinai
+# DESCRIPTION: This program keeps one loaded copy of every dictionary
+#              file, shared by all the boards of the process
+###################################################################
+import hashlib
+import os
+import threading
+
+import compiled_dictionary
+from trie import Trie
+from word_store import WordStore
+
+_dictionaries = {}
+_lock = threading.Lock()
+
+
+def load_text(file_path):
+    """
+    This function reads a dictionary text file into a new trie
+    :param file_path: String - path to the dictionary file
+    :return: Trie - words of the dictionary
+    """
+    with open(file_path) as f:
+        return Trie(word.strip() for word in f if word.strip())
+
+
+def load_words(file_path):
+    """
+    This function loads a dictionary from its compiled file. If the compiled
+    file is missing or stale, the text file is read instead and compiled for
+    the next time
+    :param file_path: String - path to the dictionary file
+    :return: Trie - words of the dictionary
+    """
+    words = compiled_dictionary.load_compiled(file_path)
+    if words is None:
+        words = load_text(file_path)
+        try:
+            compiled_dictionary.compile_dictionary(file_path, words)
+        except (OSError, ValueError):
+            pass
+    return words
+
+
+def load_word_store(file_path):
+    """
+    This function reads a dictionary text file into a new word store
+    :param file_path: String - path to the dictionary file
+    :return: WordStore - words of the dictionary
+    """
+    with open(file_path) as f:
+        return WordStore(word.strip() for word in f if word.strip())
+
+
+def hash_file(file_path):
+    """
+    This function hashes the contents of a dictionary file
+    :param file_path: String - path to the dictionary file
+    :return: String - hex digest of the file
+    """
+    digest = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def get_cached(file_path, loader):
+    """
+    This function returns a dictionary file loaded by a given loader. The
+    file is loaded only the first time, or again after it was modified
+    :param file_path: String - path to the dictionary file
+    :param loader: Function - loads the file, e.g. load_words
+    :return: The loaded dictionary, shared between the callers
+    """
+    path = os.path.abspath(file_path)
+    modified = os.stat(path).st_mtime_ns
+    with _lock:
+        cached = _dictionaries.get((path, loader))
+        if cached is None or cached[0] != modified:
+            cached = (modified, loader(path))
+            _dictionaries[(path, loader)] = cached
+        return cached[1]
+
+
+def get_dictionary(file_path):
+    """
+    This function returns the words of a dictionary file as a trie
+    :param file_path: String - path to the dictionary file
+    :return: Trie - words of the dictionary, shared between the callers
+    """
+    return get_cached(file_path, load_words)
+
+
+def get_word_store(file_path):
+    """
+    This function returns the words of a dictionary file as a compact
+    sorted word store, for callers that go over the whole word list
+    :param file_path: String - path to the dictionary file
+    :return: WordStore - words of the dictionary, shared between the callers
+    """
+    return get_cached(file_path, load_word_store)
+
+
+def get_dictionary_hash(file_path):
+    """
+    This function returns a hash of a dictionary file's contents, which
+    changes whenever the words change
+    :param file_path: String - path to the dictionary file
+    :return: String - hex digest of the file
+    """
+    return get_cached(file_path, hash_file)
+
+
+def invalidate(file_path=None):
+    """
+    This function drops a dictionary from the cache, so the next
+    get_dictionary or get_word_store reads it again
+    :param file_path: String - path to the dictionary file, or None to drop
+    all the dictionaries
+    :return: None
+    """
+    with _lock:
+        if file_path is None:
+            _dictionaries.clear()
+        else:
+            path = os.path.abspath(file_path)
+            for key in [key for key in _dictionaries if key[0] == path]:
+                del _dictionaries[key]
+
+
+def reload_dictionary(file_path):
+    """
+    This function reads a dictionary file again and replaces its cached copy
+    :param file_path: String - path to the dictionary file
+    :return: Trie - words of the dictionary
+    """
+    invalidate(file_path)
+    return get_dictionary(file_path)
@@ -3,8 +3,13 @@
 # WRITER: Daniel Sinai
 # DESCRIPTION: This program implements the Game class
 ###################################################################
+import threading
+
 import boggle_board_randomizer as bbr
+import boggle_utils as utils
+import solve_cache
 from board import Board
+from game_timer import GameTimer
 
 
 class Game:
@@ -12,23 +17,74 @@ class Game:
     This class manages the logical part of the game
     """
     SCORE_POWER = 2
+    GAME_DURATION = 180
 
-    def __init__(self):
+    def __init__(self, rows=bbr.BOARD_SIZE, cols=None, dice_list=None,
+                 generator=None, solve_in_background=True):
         """
         This function initializes a new instance
+        :param rows: Integer - number of rows of the board
+        :param cols: Integer - number of columns, None for a square board
+        :param dice_list: List of lists of strings - dice, None for the dice
+        set that fits the board size
+        :param generator: BoardGenerator of boards of the same size, whose
+        boards come already solved, or None for a plain random board
+        :param solve_in_background: Boolean - True to find the words of the
+        board in a background thread right away, False to find them only
+        when they are first needed
         """
+        self.__rows = rows
+        self.__cols = rows if cols is None else cols
+        self.__dice_list = dice_list or bbr.get_dice(self.__rows, self.__cols)
+        self.__generator = generator
+        self.__answers = None
         self.__game_board = self.create_board()
         self.__words_list = self.__game_board.get_words_list()
-        self.__words_found = []
-        self.__path = []
+        self.__words_found = {}
+        self.__score = 0
+        self.__timer = GameTimer(self.GAME_DURATION)
+        self.__answers_ready = threading.Event()
+        self.__lazy_solve = None
+        if self.__answers is not None:
+            self.__answers_ready.set()
+        elif solve_in_background:
+            self.__answers = {}
+            threading.Thread(target=self.__solve_board, daemon=True).start()
+        else:
+            self.__answers = {}
+            self.__lazy_solve = threading.Lock()
+
+    def __solve_board(self):
+        """
+        This function finds all the words of the board, with their highest
+        scoring paths. It runs in a background thread when the game is
+        created. The board goes through the shared solve cache, so a board
+        that was solved before, or a rotation or reflection of it, is not
+        solved again
+        :return: None
+        """
+        try:
+            self.__answers = solve_cache.get_solve_cache(
+                self.__game_board.get_words_path()).solve_board(
+                self.__game_board.get_board())
+        finally:
+            self.__answers_ready.set()
 
     def create_board(self):
         """
-        This function creates a new game board
+        This function creates a new game board. A board taken from the
+        generator comes with its answers, so it does not need to be solved
         :return: Board object
         """
-        game_board = Board(bbr.BOARD_SIZE)
-        game_board.init_board(bbr.randomize_board())
+        game_board = Board(self.__rows, self.__cols,
+                           bbr.get_board_dice(self.__dice_list, self.__rows,
+                                              self.__cols))
+        if self.__generator is not None:
+            board, self.__answers = self.__generator.get_board()
+            game_board.init_board(board)
+        else:
+            game_board.init_board(bbr.randomize_board(
+                self.__dice_list, self.__rows, self.__cols))
         return game_board
 
     def get_board_object(self):
@@ -59,3 +115,125 @@ class Game:
         :return: Integer - score
         """
         return (len(path)) ** self.SCORE_POWER
+
+    def submit_path(self, path):
+        """
+        This function checks a path chosen by the player and records its
+        word as found
+        :param path: List of tuples - path
+        :return: Tuple - (the word, or None if the path is not a word on the
+        board, the score it got, 0 if it is not a new word)
+        """
+        word = utils.is_valid_path(self.get_board_as_list(), path,
+                                   self.__words_list)
+        if word is None or word in self.__words_found:
+            return word, 0
+        self.__words_found[word] = path
+        score = self.calculate_word_score(path)
+        self.__score += score
+        return word, score
+
+    def submit_word(self, word):
+        """
+        This function checks a word typed by the player. The word is looked
+        up in the dictionary and its highest scoring path on the board is
+        found, and then it counts like a submitted path
+        :param word: String - word, in any case
+        :return: Tuple - see submit_path
+        """
+        if not isinstance(word, str):
+            raise TypeError("a word must be a string, not %s"
+                            % type(word).__name__)
+        word = word.strip().upper()
+        if word not in self.__words_list:
+            return None, 0
+        path = utils.find_word_path(self.get_board_as_list(), word)
+        if path is None:
+            return None, 0
+        return self.submit_path(path)
+
+    def get_words_found(self):
+        """
+        This function returns the words submitted and found so far
+        :return: List of strings - words in the order they were found
+        """
+        return list(self.__words_found)
+
+    def get_score(self):
+        """
+        This function returns the score of the words found so far
+        :return: Integer - score
+        """
+        return self.__score
+
+    def start_timer(self):
+        """
+        This function starts the game clock
+        :return: None
+        """
+        self.__timer.start()
+
+    def get_timer(self):
+        """
+        This function returns the game clock
+        :return: GameTimer object
+        """
+        return self.__timer
+
+    def wait_for_answers(self, timeout=None):
+        """
+        This function waits until all the words of the board are found
+        :param timeout: Float - seconds to wait, None to wait until done
+        :return: Boolean - True if the answers are ready
+        """
+        if self.__lazy_solve is not None and \
+                not self.__answers_ready.is_set():
+            with self.__lazy_solve:
+                if not self.__answers_ready.is_set():
+                    self.__solve_board()
+        return self.__answers_ready.wait(timeout)
+
+    def get_answers(self):
+        """
+        This function returns all the words of the board
+        :return: Dictionary - word to its highest scoring path
+        """
+        self.wait_for_answers()
+        return self.__answers
+
+    def is_answer(self, word):
+        """
+        This function checks if a word can be found on the board
+        :param word: String - word
+        :return: Boolean
+        """
+        return word in self.get_answers()
+
+    def get_word_score(self, word):
+        """
+        This function returns the best score a word can get on the board
+        :param word: String - word
+        :return: Integer - score, 0 if the word is not on the board
+        """
+        path = self.get_answers().get(word)
+        if path is None:
+            return 0
+        return self.calculate_word_score(path)
+
+    def get_missed_words(self, words_found):
+        """
+        This function returns the words of the board that were not found
+        :param words_found: Collection of strings - words found
+        :return: List of strings - missed words
+        """
+        words_found = set(words_found)
+        return [word for word in self.get_answers()
+                if word not in words_found]
+
+    def get_words_remaining(self, words_found):
+        """
+        This function returns how many words of the board are left to find
+        :param words_found: Collection of strings - words found
+        :return: Integer - number of words
+        """
+        return len(self.get_missed_words(words_found))
@@ -0,0 +1,101 @@
+###################################################################
+# FILE: game_timer.py
+# WRITER: Daniel Sinai
+# DESCRIPTION: This program implements the GameTimer class - the
+#              clock of a single game
+###################################################################
+import math
+import time
+
+
+class GameTimer:
+    """
+    This class keeps the time of a game as one deadline on a monotonic
+    clock. The time left is always computed from the deadline, so however
+    late the display is refreshed it never drifts from the end of the game.
+    It needs no GUI, and the clock can be replaced to control it
+    """
+    def __init__(self, duration, clock=time.monotonic):
+        """
+        This function initializes a new instance
+        :param duration: Float - length of the game in seconds
+        :param clock: Function - returns the current time in seconds
+        """
+        self.__duration = duration
+        self.__clock = clock
+        self.__deadline = None
+
+    def start(self):
+        """
+        This function starts the game clock. Starting it again restarts it
+        :return: None
+        """
+        self.__deadline = self.__clock() + self.__duration
+
+    def is_started(self):
+        """
+        This function checks if the clock was started
+        :return: Boolean
+        """
+        return self.__deadline is not None
+
+    def get_time_left(self):
+        """
+        This function returns the time left until the end of the game
+        :return: Float - seconds, never less than 0
+        """
+        if self.__deadline is None:
+            return float(self.__duration)
+        return max(self.__deadline - self.__clock(), 0.0)
+
+    def get_time_since_end(self):
+        """
+        This function returns how long ago the game ended
+        :return: Float - seconds, 0 if the game is not over
+        """
+        if self.__deadline is None:
+            return 0.0
+        return max(self.__clock() - self.__deadline, 0.0)
+
+    def get_seconds_left(self):
+        """
+        This function returns the time left as shown on a clock that counts
+        down whole seconds
+        :return: Integer - seconds
+        """
+        return math.ceil(self.get_time_left())
+
+    def is_over(self):
+        """
+        This function checks if the game time is over
+        :return: Boolean
+        """
+        return self.__deadline is not None and self.get_time_left() == 0
+
+    def get_next_tick(self):
+        """
+        This function returns how long until the shown whole seconds change,
+        or until the game ends
+        :return: Float - seconds
+        """
+        time_left = self.get_time_left()
+        return time_left % 1 or min(time_left, 1.0)
+
+    def iter_ticks(self, sleep=time.sleep):
+        """
+        This function waits for every change of the shown whole seconds and
+        yields the seconds left, until the game is over. It is the headless
+        counterpart of refreshing a clock on the screen
+        :param sleep: Function - waits a given number of seconds
+        :return: Iterator of integers - seconds left
+        """
+        if self.__deadline is None:
+            self.start()
+        shown = self.get_seconds_left()
+        yield shown
+        while not self.is_over():
+            sleep(self.get_next_tick())
+            seconds = self.get_seconds_left()
+            if seconds != shown:
+                shown = seconds
+                yield shown
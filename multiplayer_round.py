@@ -0,0 +1,71 @@
+###################################################################
+# FILE: multiplayer_round.py
+# WRITER: Daniel Sinai
+# DESCRIPTION: This program resolves a multiplayer round - words found
+#              by more than one player score nothing
+###################################################################
+from collections import Counter
+
+import boggle_utils as utils
+
+
+def validate_paths(board, paths, words):
+    """
+    This function finds the word of every distinct path. A path submitted
+    by many players is checked once
+    :param board: List of lists - board
+    :param paths: Iterable of paths - lists of cells
+    :param words: Trie or list of strings - words from the dictionary
+    :return: Dictionary - path as a tuple of cells to its word, or None if
+    the path is not a valid word
+    """
+    checked = {}
+    for path in paths:
+        key = tuple(map(tuple, path))
+        if key not in checked:
+            checked[key] = utils.is_valid_path(board, key, words)
+    return checked
+
+
+def resolve_round(game, submissions):
+    """
+    This function scores the paths that every player submitted in a round.
+    Each player's paths are reduced to a set of words, keeping the longest
+    path of a word, a Counter over those sets finds the words more than one
+    player found, and these are cancelled. The other words are scored with
+    the game's calculate_word_score
+    :param game: Game object - the game whose board was played
+    :param submissions: Dictionary - player to an iterable of paths
+    :return: Dictionary - player to a dictionary with the "score", the
+    scored "words", the "cancelled" words and the number of "invalid" paths
+    """
+    submissions = {player: [tuple(map(tuple, path)) for path in paths]
+                   for player, paths in submissions.items()}
+    checked = validate_paths(
+        game.get_board_as_list(),
+        set().union(*submissions.values()),
+        game.get_board_object().get_words_list())
+    found = {}
+    for player, keys in submissions.items():
+        best = {}
+        invalid = 0
+        for key in keys:
+            word = checked[key]
+            if word is None:
+                invalid += 1
+            elif word not in best or len(best[word]) < len(key):
+                best[word] = key
+        found[player] = (best, invalid)
+
+    counts = Counter(word for best, _ in found.values() for word in best)
+    shared = {word for word, count in counts.items() if count > 1}
+    results = {}
+    for player, (best, invalid) in found.items():
+        scored = [word for word in best if word not in shared]
+        results[player] = {
+            "score": sum(game.calculate_word_score(list(best[word]))
+                         for word in scored),
+            "words": scored,
+            "cancelled": [word for word in best if word in shared],
+            "invalid": invalid}
+    return results
@@ -0,0 +1,398 @@
+###################################################################
+# FILE: numpy_board.py
+# WRITER: Daniel Sinai
+# DESCRIPTION: This program implements a NumPy encoding of boggle
+#              boards and a breadth-wise solver that expands all the
+#              partial paths of one depth together
+###################################################################
+import weakref
+
+import boggle_utils as utils
+import compiled_dictionary
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEAD_NODE = 0
+DEAD_CUBE = 0
+DEFAULT_BATCH_SIZE = 256
+
+_prefix_tables = weakref.WeakKeyDictionary()
+
+
+def require_numpy():
+    """
+    This function makes sure NumPy is installed
+    :return: None
+    """
+    if np is None:
+        raise ImportError("numpy_board needs NumPy - pip install numpy")
+
+
+class PrefixTable:
+    """
+    This class represents a dictionary trie as dense NumPy arrays. Node 0 is
+    a dead node that every missing letter leads to, so a whole array of
+    nodes can be advanced by one letter with a single indexing operation.
+    Every transition also carries an offset, and the offsets along a word
+    add up to the word's index in sorted order - a number that identifies
+    the word without building its string
+    """
+    def __init__(self, trie):
+        """
+        This function initializes a new instance
+        :param trie: Trie - words from the dictionary
+        """
+        require_numpy()
+        nodes, edges = compiled_dictionary.flatten(trie)
+        word_counts = count_words(nodes, edges)
+        nodes = np.frombuffer(nodes, dtype=np.uint32).astype(np.int64)
+        edges = np.frombuffer(edges, dtype=np.uint32).astype(np.int64)
+        edge_letters = edges >> compiled_dictionary.LETTER_SHIFT
+        letters = np.unique(edge_letters)
+        self.__alphabet = {chr(code): index for index, code in
+                           enumerate(letters.tolist())}
+        counts = (nodes >> compiled_dictionary.COUNT_SHIFT) & \
+            compiled_dictionary.COUNT_MASK
+        parents = np.repeat(np.arange(len(nodes)), counts)
+        children = edges & compiled_dictionary.CHILD_MASK
+        self.__is_word = np.zeros(len(nodes) + 1, dtype=bool)
+        self.__is_word[1:] = nodes & compiled_dictionary.WORD_FLAG
+
+        child_counts = np.asarray(word_counts, dtype=np.int64)[children]
+        before = np.cumsum(child_counts) - child_counts
+        first_edges = nodes >> compiled_dictionary.EDGES_SHIFT
+        siblings_before = before - before[first_edges[parents]]
+        shape = (len(nodes) + 1, len(letters))
+        self.__transitions = np.zeros(shape, dtype=np.int32)
+        self.__offsets = np.zeros(shape, dtype=np.int32)
+        letter_indices = np.searchsorted(letters, edge_letters)
+        self.__transitions[parents + 1, letter_indices] = children + 1
+        self.__offsets[parents + 1, letter_indices] = \
+            siblings_before + self.__is_word[parents + 1]
+        self.__cube_codes = {}
+        self.__cube_transitions = np.zeros((shape[0], 1), dtype=np.int32)
+        self.__cube_offsets = np.zeros((shape[0], 1), dtype=np.int32)
+        self.root = 1
+        self.word_count = int(word_counts[0])
+
+    def get_is_word(self):
+        """
+        This function returns which nodes end a word
+        :return: NumPy array of booleans - indexed by node
+        """
+        return self.__is_word
+
+    def get_cube_codes(self, cube_table):
+        """
+        This function returns the codes of cubes in the cube transitions
+        matrices, adding the cubes that are new to them. Code 0 is a dead
+        cube that leads every node to the dead node
+        :param cube_table: List of strings - cube letters
+        :return: NumPy array of integers - code of every cube
+        """
+        new_cubes = [cube for cube in dict.fromkeys(cube_table)
+                     if cube not in self.__cube_codes]
+        if new_cubes:
+            transitions, offsets = self.__compute_cubes(new_cubes)
+            self.__cube_transitions = np.concatenate(
+                [self.__cube_transitions, transitions], axis=1)
+            self.__cube_offsets = np.concatenate(
+                [self.__cube_offsets, offsets], axis=1)
+            for cube in new_cubes:
+                self.__cube_codes[cube] = len(self.__cube_codes) + 1
+        return np.array([self.__cube_codes[cube] for cube in cube_table],
+                        dtype=np.int64)
+
+    def get_cube_transitions(self):
+        """
+        This function returns where every node goes by every cube code
+        :return: Tuple of NumPy arrays - nodes x cube codes, next node and
+        word index offset
+        """
+        return self.__cube_transitions, self.__cube_offsets
+
+    def __compute_cubes(self, cube_table):
+        """
+        This function computes where every node goes by every cube
+        :param cube_table: List of strings - cube letters
+        :return: Tuple of NumPy arrays - nodes x cubes, next node and word
+        index offset
+        """
+        shape = (len(self.__transitions), len(cube_table))
+        transitions = np.empty(shape, dtype=np.int32)
+        offsets = np.empty(shape, dtype=np.int32)
+        for code, cube in enumerate(cube_table):
+            current = np.arange(len(self.__transitions), dtype=np.int32)
+            offset = np.zeros(len(self.__transitions), dtype=np.int32)
+            for letter in cube:
+                index = self.__alphabet.get(letter)
+                if index is None:
+                    current = np.zeros_like(current)
+                    break
+                offset += self.__offsets[current, index]
+                current = self.__transitions[current, index]
+            transitions[:, code] = current
+            offsets[:, code] = offset
+        return transitions, offsets
+
+
+def count_words(nodes, edges):
+    """
+    This function counts the words below every node of a flattened trie
+    :param nodes: Array of integers - nodes, see MappedTrie
+    :param edges: Array of integers - edges, see MappedTrie
+    :return: List of integers - number of words by node
+    """
+    counts = [None] * len(nodes)
+    stack = [0]
+    while stack:
+        node = stack[-1]
+        entry = nodes[node]
+        first = entry >> compiled_dictionary.EDGES_SHIFT
+        children = [edges[index] & compiled_dictionary.CHILD_MASK
+                    for index in range(first, first + (
+                        (entry >> compiled_dictionary.COUNT_SHIFT) &
+                        compiled_dictionary.COUNT_MASK))]
+        pending = [child for child in children if counts[child] is None]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        counts[node] = (entry & compiled_dictionary.WORD_FLAG) + \
+            sum(counts[child] for child in children)
+    return counts
+
+
+def get_prefix_table(trie):
+    """
+    This function returns the prefix table of a trie, building it only once
+    :param trie: Trie - words from the dictionary
+    :return: PrefixTable
+    """
+    table = _prefix_tables.get(trie)
+    if table is None:
+        table = PrefixTable(trie)
+        _prefix_tables[trie] = table
+    return table
+
+
+class NumpyBoard:
+    """
+    This class represents one or more boards of the same size as NumPy
+    arrays - a uint8 code per cell, a table of the cube letters of every
+    code (so a 'QU' cube is one code) and a matrix of neighbor indices
+    """
+    def __init__(self, boards, cube_table=None):
+        """
+        This function initializes a new instance
+        :param boards: List of boards - lists of lists of strings
+        :param cube_table: List of strings - existing cube codes to extend
+        """
+        require_numpy()
+        self.rows, self.cols = len(boards[0]), len(boards[0][0])
+        self.cube_table = list(cube_table or [])
+        cube_codes = {cube: code for code, cube in enumerate(self.cube_table)}
+        codes = []
+        for board in boards:
+            for row in board:
+                for cube in row:
+                    if cube not in cube_codes:
+                        cube_codes[cube] = len(self.cube_table)
+                        self.cube_table.append(cube)
+                    codes.append(cube_codes[cube])
+        if len(self.cube_table) > 0x100:
+            raise ValueError("Too many different cubes for uint8 codes")
+        self.codes = np.array(codes, dtype=np.uint8).reshape(
+            len(boards), self.rows * self.cols)
+        neighbors = utils.board_geometry(self.rows, self.cols)[2]
+        self.neighbors = np.full((len(neighbors), 8), -1, dtype=np.int32)
+        for index, cell_neighbors in enumerate(neighbors):
+            self.neighbors[index, :len(cell_neighbors)] = cell_neighbors
+
+
+def solve_boards(boards, words, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    This function finds every dictionary word on many boards of the same
+    size. All the partial paths of one depth, across all the boards of a
+    batch, are expanded together and filtered against the dictionary
+    prefix table in bulk
+    :param boards: List of boards - lists of lists of strings
+    :param words: Trie or list of strings - words from the dictionary
+    :param batch_size: Integer - number of boards expanded together
+    :return: List of dictionaries - for every board, word to its highest
+    scoring path, in the same order as solve_board
+    """
+    table = get_prefix_table(utils.as_trie(words))
+    results = []
+    for start in range(0, len(boards), batch_size):
+        batch = boards[start:start + batch_size]
+        found = [{} for _ in batch]
+        for board_ids, ranks, history in expand_paths(batch, table):
+            add_found_paths(found, board_ids, ranks, history)
+        cells = utils.get_geometry(batch[0])[0]
+        results.extend(order_found_words(board, board_found, cells)
+                       for board, board_found in zip(batch, found))
+    return results
+
+
+def solve_board(board, words):
+    """
+    This function finds every dictionary word on a single board
+    :param board: List of lists - board
+    :param words: Trie or list of strings - words from the dictionary
+    :return: Dictionary - word to its highest scoring path
+    """
+    return solve_boards([board], words)[0]
+
+
+def score_boards(boards, words, score_power=2,
+                 batch_size=DEFAULT_BATCH_SIZE):
+    """
+    This function computes the total score of every board - the sum of
+    len(path) ** score_power over the highest scoring path of every word -
+    without leaving NumPy
+    :param boards: List of boards of the same size
+    :param words: Trie or list of strings - words from the dictionary
+    :param score_power: Integer - power of the path length in the score
+    :param batch_size: Integer - number of boards expanded together
+    :return: NumPy array of integers - score of every board
+    """
+    table = get_prefix_table(utils.as_trie(words))
+    scores = []
+    for start in range(0, len(boards), batch_size):
+        batch = boards[start:start + batch_size]
+        keys = []
+        lengths = []
+        for board_ids, ranks, length in expand_paths(batch, table, False):
+            keys.append(board_ids * table.word_count + ranks)
+            lengths.append(np.full(len(ranks), length))
+        best = np.zeros(len(batch))
+        if keys:
+            keys = np.concatenate(keys)
+            lengths = np.concatenate(lengths)
+            order = np.lexsort((-lengths, keys))
+            keys, lengths = keys[order], lengths[order]
+            first = np.ones(len(keys), dtype=bool)
+            first[1:] = keys[1:] != keys[:-1]
+            best = np.bincount(keys[first] // table.word_count,
+                               weights=lengths[first] ** score_power,
+                               minlength=len(batch))
+        scores.append(best.astype(np.int64))
+    return np.concatenate(scores) if scores else np.zeros(0, dtype=np.int64)
+
+
+def expand_paths(boards, table, keep_paths=True):
+    """
+    This function expands all the paths of a batch of boards one depth at a
+    time, keeping only paths whose letters are a prefix of a word. Visited
+    cells are kept as rows of 64 bit masks
+    :param boards: List of boards of the same size
+    :param table: PrefixTable - words from the dictionary
+    :param keep_paths: Boolean - False to skip building the paths matrix
+    :return: Iterator of tuples - for every depth, the paths that spell a
+    word: (board indices, word indices, path indices matrix or the path
+    length). The paths of a board come in the order a depth first search
+    would find them
+    """
+    encoded = NumpyBoard(boards)
+    cube_codes = table.get_cube_codes(encoded.cube_table)
+    transitions, offsets = table.get_cube_transitions()
+    code_count = transitions.shape[1]
+    transitions = transitions.ravel()
+    offsets = offsets.ravel()
+    is_word = table.get_is_word()
+    cell_count = encoded.rows * encoded.cols
+    mask_count = (cell_count + 63) // 64
+
+    # the padding of the neighbors matrix points to an extra dead cell
+    neighbors = np.where(encoded.neighbors >= 0, encoded.neighbors,
+                         cell_count)
+    codes = np.full((len(boards), cell_count + 1), DEAD_CUBE, dtype=np.int64)
+    codes[:, :cell_count] = cube_codes[encoded.codes]
+    codes = codes.ravel()
+    step_masks = np.uint64(1) << (np.arange(cell_count + 1) %
+                                  64).astype(np.uint64)
+    step_words = np.arange(cell_count + 1) // 64
+
+    board_ids = np.repeat(np.arange(len(boards)), cell_count)
+    last = np.tile(np.arange(cell_count), len(boards))
+    flat = table.root * code_count + codes[board_ids * (cell_count + 1) +
+                                           last]
+    nodes = transitions[flat]
+    ranks = offsets[flat].astype(np.int64)
+    alive = nodes != DEAD_NODE
+    board_ids, last = board_ids[alive], last[alive]
+    nodes, ranks = nodes[alive], ranks[alive]
+    visited = np.zeros((len(nodes), mask_count), dtype=np.uint64)
+    visited[np.arange(len(nodes)), step_words[last]] = step_masks[last]
+    history = last[:, None]
+    depth = 1
+
+    while len(nodes):
+        words = is_word[nodes]
+        if words.any():
+            yield board_ids[words], ranks[words], \
+                history[words] if keep_paths else depth
+
+        steps = neighbors[last]
+        rows = np.arange(len(nodes))[:, None]
+        flat = nodes[:, None] * code_count + \
+            codes[(board_ids * (cell_count + 1))[:, None] + steps]
+        next_nodes = transitions[flat]
+        valid = (next_nodes != DEAD_NODE) & \
+            (visited[rows, step_words[steps]] & step_masks[steps] == 0)
+        parents, slots = np.nonzero(valid)
+        board_ids = board_ids[parents]
+        last = steps[parents, slots]
+        ranks = ranks[parents] + offsets[flat[parents, slots]]
+        nodes = next_nodes[parents, slots]
+        visited = visited[parents]
+        visited[np.arange(len(nodes)), step_words[last]] |= step_masks[last]
+        if keep_paths:
+            history = np.concatenate([history[parents], last[:, None]],
+                                     axis=1)
+        depth += 1
+
+
+def add_found_paths(found, board_ids, ranks, history):
+    """
+    This function records the paths of one depth that spell a word. Only
+    the first path of every word is kept - it is the lowest in depth first
+    order, and all the paths of a depth have the same length
+    :param found: List of dictionaries - word index to (first path, best
+    path), by board
+    :param board_ids: NumPy array - board index of every path
+    :param ranks: NumPy array - word index of every path
+    :param history: NumPy array - path indices, one path per row
+    :return: None
+    """
+    keys = board_ids * (int(ranks.max()) + 1) + ranks
+    _, rows = np.unique(keys, return_index=True)
+    for board_id, rank, path in zip(board_ids[rows].tolist(),
+                                    ranks[rows].tolist(),
+                                    history[rows].tolist()):
+        board_found = found[board_id]
+        if rank in board_found:
+            board_found[rank] = (min(board_found[rank][0], path), path)
+        else:
+            board_found[rank] = (path, path)
+
+
+def order_found_words(board, board_found, cells):
+    """
+    This function orders the words of a board the way the depth first
+    solve_board finds them
+    :param board: List of lists - board
+    :param board_found: Dictionary - word index to (first path, best path)
+    :param cells: Tuple of tuples - board cells by index
+    :return: Dictionary - word to its highest scoring path
+    """
+    cols = len(board[0])
+    words_dict = {}
+    for first, best in sorted(board_found.values()):
+        word = "".join(board[index // cols][index % cols] for index in first)
+        words_dict[word] = [cells[index] for index in best]
+    return words_dict
@@ -0,0 +1,215 @@
+###################################################################
+# FILE: parallel_solve.py
+# WRITER: Daniel Sinai
+# DESCRIPTION: This program solves a single large board over a pool
+#              of processes, split by the first two cells of a path
+###################################################################
+import argparse
+import multiprocessing
+import random
+import time
+
+import boggle_batch
+import boggle_board_randomizer as bbr
+import boggle_utils as utils
+import dictionary_cache
+from board import FILE_PATH
+
+DEFAULT_ROWS = 6
+DEFAULT_BOARDS = 5
+DEFAULT_DEPTH = 1
+
+
+def solve_subtree(task):
+    """
+    This function finds the words of the paths that start with given cells,
+    like solve_board does for the whole board
+    :param task: Tuple - (board, tuple of the indices the paths start with)
+    :return: Tuple - (the start indices, list of (word, path indices) in
+    the order the words were found)
+    """
+    board, prefix = task
+    cells, indices, neighbors = utils.get_geometry(board)
+    letters_list = [letters for row in board for letters in row]
+    trie = boggle_batch.get_worker_words()
+    words_dict = {}
+    node = trie.get_root()
+    word = ""
+    visited = 0
+    for index in prefix:
+        node = trie.get_child(node, letters_list[index])
+        if node is None:
+            return prefix, []
+        word += letters_list[index]
+        visited |= 1 << index
+    utils.solve_board_helper(trie, range(len(cells)), neighbors,
+                             letters_list, words_dict, list(prefix), visited,
+                             word, node)
+    return prefix, list(words_dict.items())
+
+
+def get_tasks(board, depth):
+    """
+    This function splits the search of a board into tasks
+    :param board: List of lists - board
+    :param depth: Integer - 1 for a task per start cell, 2 for a task per
+    pair of first two cells
+    :return: List of tuples - see solve_subtree
+    """
+    neighbors = utils.get_geometry(board)[2]
+    if depth == 1:
+        return [(board, (start,)) for start in range(len(neighbors))]
+    return [(board, (start, step)) for start in range(len(neighbors))
+            for step in neighbors[start]]
+
+
+def merge_results(board, words, results, depth):
+    """
+    This function merges the words of all the tasks into the result of
+    solve_board. A word keeps its longest path, and among paths of the same
+    length the one the serial search finds first, and the words are ordered
+    by where they are first found, exactly like the serial search
+    :param board: List of lists - board
+    :param words: Trie - words from the dictionary
+    :param results: Iterable of tuples - see solve_subtree, in any order
+    :param depth: Integer - the depth the tasks were split at
+    :return: Dictionary - word to its highest scoring path
+    """
+    cells = utils.get_geometry(board)[0]
+    first_found = {}
+    best = {}
+    if depth > 1:
+        letters_list = [letters for row in board for letters in row]
+        for start, letters in enumerate(letters_list):
+            node = words.get_child(words.get_root(), letters)
+            if node is not None and words.is_word(node) and \
+                    letters not in best:
+                first_found[letters] = ((start,), 0)
+                best[letters] = ((start,), [start])
+    for prefix, words_list in results:
+        for position, (word, path) in enumerate(words_list):
+            if word not in best:
+                first_found[word] = (prefix, position)
+                best[word] = (prefix, path)
+                continue
+            first_found[word] = min(first_found[word], (prefix, position))
+            best_prefix, best_path = best[word]
+            if len(path) > len(best_path) or \
+                    (len(path) == len(best_path) and prefix < best_prefix):
+                best[word] = (prefix, path)
+    return {word: [cells[index] for index in best[word][1]]
+            for word in sorted(first_found, key=first_found.get)}
+
+
+class ParallelSolver:
+    """
+    This class keeps a pool of processes, each with its own copy of the
+    dictionary, and solves one board at a time over all of them. The board
+    is split into a task per start cell, or per pair of first two cells,
+    and the tasks are handed out one at a time as workers become free, so
+    a worker that drew a small subtree takes the next task instead of
+    waiting for the others
+    """
+    def __init__(self, processes=None, file_path=FILE_PATH,
+                 depth=DEFAULT_DEPTH):
+        """
+        This function initializes a new instance
+        :param processes: Integer - number of workers, None for one per core
+        :param file_path: String - path to the dictionary file
+        :param depth: Integer - 1 for a task per start cell, 2 for smaller
+        tasks, one per pair of first two cells
+        """
+        self.__depth = depth
+        self.__words = dictionary_cache.get_dictionary(file_path)
+        self.__pool = multiprocessing.Pool(
+            processes, initializer=boggle_batch.init_worker,
+            initargs=(file_path,))
+
+    def solve_board(self, board):
+        """
+        This function finds every dictionary word on the board, with the
+        same result as boggle_utils.solve_board
+        :param board: List of lists - board
+        :return: Dictionary - word to its highest scoring path, in the order
+        the serial search finds the words
+        """
+        results = self.__pool.imap_unordered(
+            solve_subtree, get_tasks(board, self.__depth), 1)
+        return merge_results(board, self.__words, results, self.__depth)
+
+    def max_score_paths(self, board):
+        """
+        This function returns the paths of the highest scoring words, like
+        boggle_utils.max_score_paths
+        :param board: List of lists - board
+        :return: List of lists of tuples - paths, shorter words first
+        """
+        return utils.get_paths_by_length(self.solve_board(board))
+
+    def close(self):
+        """
+        This function stops the workers
+        :return: None
+        """
+        self.__pool.close()
+        self.__pool.join()
+
+    def __enter__(self):
+        """
+        This function enters a with block
+        :return: ParallelSolver
+        """
+        return self
+
+    def __exit__(self, *exc_info):
+        """
+        This function stops the workers when leaving a with block
+        :param exc_info: The exception raised in the block, if any
+        :return: None
+        """
+        self.close()
+
+
+def main():
+    """
+    This function times solving seeded boards serially and over pools of
+    1 to N processes, and prints the speedup of every pool size
+    :return: None
+    """
+    parser = argparse.ArgumentParser(
+        description="Speedup of solving one board over many processes")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS)
+    parser.add_argument("--boards", type=int, default=DEFAULT_BOARDS)
+    parser.add_argument("--processes", type=int,
+                        default=multiprocessing.cpu_count())
+    parser.add_argument("--depth", type=int, choices=(1, 2),
+                        default=DEFAULT_DEPTH)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dictionary", default=FILE_PATH)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    dice_list = bbr.get_dice(args.rows)
+    boards = [bbr.randomize_board(dice_list, args.rows)
+              for _ in range(args.boards)]
+    words = dictionary_cache.get_dictionary(args.dictionary)
+    start = time.perf_counter()
+    expected = [utils.solve_board(board, words) for board in boards]
+    serial = time.perf_counter() - start
+    print("%-10s %10s %10s" % ("processes", "sec/board", "speedup"))
+    print("%-10s %10.4f %10.2f" % ("serial", serial / len(boards), 1.0))
+    for processes in range(1, args.processes + 1):
+        with ParallelSolver(processes, args.dictionary,
+                            args.depth) as solver:
+            solver.solve_board(boards[0])
+            start = time.perf_counter()
+            results = [solver.solve_board(board) for board in boards]
+            elapsed = time.perf_counter() - start
+        if results != expected:
+            print("results differ from the serial solver")
+        print("%-10d %10.4f %10.2f" % (processes, elapsed / len(boards),
+                                       serial / elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+###################################################################
+# FILE: path_validator.py
+# WRITER: Daniel Sinai
+# DESCRIPTION: This program implements the PathValidator class, which
+#              checks a path one cell at a time while it is chosen
+###################################################################
+import boggle_utils as utils
+
+
+class PathValidator:
+    """
+    This class follows a path while the player builds it. Every added cell
+    is checked against the board and moves one step in the dictionary trie,
+    so knowing whether the path is still a prefix of a word, or already a
+    word, costs O(1) per cell instead of walking the whole path again
+    """
+    def __init__(self, board, words):
+        """
+        This function initializes a new instance
+        :param board: List of lists - board
+        :param words: Trie or list of strings - words from the dictionary
+        """
+        self.__trie = utils.as_trie(words)
+        self.__cells, self.__indices, self.__neighbors = \
+            utils.get_geometry(board)
+        self.__letters_list = [letters for row in board for letters in row]
+        self.reset()
+
+    def reset(self):
+        """
+        This function clears the current path
+        :return: None
+        """
+        self.__path = []
+        self.__visited = 0
+        self.__last_index = None
+        self.__word = ""
+        self.__node = self.__trie.get_root()
+
+    def add_cell(self, cell):
+        """
+        This function adds a cell to the end of the current path. Once the
+        path is illegal or no word starts with its letters, it stays dead
+        until reset is called
+        :param cell: Tuple - cell
+        :return: Boolean - True if the path is still a prefix of a word
+        """
+        self.__path.append(cell)
+        if self.__node is None:
+            return False
+        index = self.__indices.get(cell)
+        if index is None or self.__visited >> index & 1 or \
+                (self.__visited and
+                 index not in self.__neighbors[self.__last_index]):
+            self.__node = None
+            return False
+        letters = self.__letters_list[index]
+        self.__node = self.__trie.get_child(self.__node, letters)
+        self.__word += letters
+        self.__visited |= 1 << index
+        self.__last_index = index
+        return self.__node is not None
+
+    def is_alive(self):
+        """
+        This function checks if the current path can still become a word
+        :return: Boolean
+        """
+        return self.__node is not None
+
+    def is_word(self):
+        """
+        This function checks if the current path is a word
+        :return: Boolean
+        """
+        return self.__node is not None and self.__trie.is_word(self.__node)
+
+    def get_word(self):
+        """
+        This function returns the word of the current path, like
+        is_valid_path does
+        :return: String - the word if the path is valid, else None
+        """
+        if self.__path and self.is_word():
+            return self.__word
+        return
+
+    def get_path(self):
+        """
+        This function returns the current path
+        :return: List of tuples - path
+        """
+        return self.__path
+
+    def get_next_cells(self):
+        """
+        This function returns the cells that keep the path a prefix of a
+        word if they are added next
+        :return: List of tuples - cells
+        """
+        if self.__node is None:
+            return []
+        if self.__visited:
+            candidates = self.__neighbors[self.__last_index]
+        else:
+            candidates = range(len(self.__cells))
+        return [self.__cells[index] for index in candidates
+                if not self.__visited >> index & 1 and
+                self.__trie.get_child(self.__node,
+                                      self.__letters_list[index])
+                is not None]
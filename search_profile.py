@@ -0,0 +1,329 @@
+###################################################################
+# FILE: search_profile.py
+# WRITER: Daniel Sinai
+# DESCRIPTION: This program counts and times what the boggle_utils
+#              searches do, and dumps a cProfile of a seeded board
+###################################################################
+import argparse
+import cProfile
+import pstats
+import sys
+import time
+from collections import Counter
+
+import boggle_utils as utils
+import dictionary_cache
+from board import FILE_PATH
+from boggle_benchmark import seeded_boards
+from trie import Trie
+
+COUNTERS = ("nodes_visited", "branches_pruned", "dictionary_lookups",
+            "paths_emitted")
+SEARCHES = {"find_length_n_paths": utils.find_length_n_paths,
+            "find_length_n_words": utils.find_length_n_words,
+            "iter_length_n_paths": utils.iter_length_n_paths,
+            "iter_length_n_words": utils.iter_length_n_words,
+            "solve_board": utils.solve_board,
+            "max_score_paths": utils.max_score_paths}
+LENGTH_SEARCHES = ("find_length_n_paths", "find_length_n_words",
+                   "iter_length_n_paths", "iter_length_n_words")
+TRIE_SEARCHES = (utils.solve_board, utils.max_score_paths)
+DEFAULT_SORT = "cumulative"
+
+
+class SearchStats:
+    """
+    This class collects the counters and phase times of profiled searches.
+    Nothing is collected unless a search is run through profile_search, so
+    the searches themselves cost the same as before when it is not used
+    """
+    def __init__(self, callback=None):
+        """
+        This function initializes a new instance
+        :param callback: Function called with the stats after every profiled
+        search, or None
+        """
+        self.__counters = Counter()
+        self.__times = Counter()
+        self.__callback = callback
+
+    def add(self, name, amount=1):
+        """
+        This function increases a counter
+        :param name: String - name of the counter
+        :param amount: Integer - how much to add
+        :return: None
+        """
+        self.__counters[name] += amount
+
+    def add_time(self, phase, seconds):
+        """
+        This function adds time spent in a phase of a search
+        :param phase: String - name of the phase
+        :param seconds: Float - time spent
+        :return: None
+        """
+        self.__times[phase] += seconds
+
+    def get_counters(self):
+        """
+        This function returns the counters
+        :return: Dictionary - counter name to its value
+        """
+        return {name: self.__counters[name] for name in
+                COUNTERS + tuple(sorted(set(self.__counters) -
+                                        set(COUNTERS)))}
+
+    def get_times(self):
+        """
+        This function returns the time spent in every phase
+        :return: Dictionary - phase name to seconds
+        """
+        return dict(self.__times)
+
+    def notify(self):
+        """
+        This function calls the callback with the stats, if there is one
+        :return: None
+        """
+        if self.__callback is not None:
+            self.__callback(self)
+
+    def reset(self):
+        """
+        This function clears the counters and the times
+        :return: None
+        """
+        self.__counters.clear()
+        self.__times.clear()
+
+    def __str__(self):
+        """
+        This function returns the stats as a printable table
+        :return: String
+        """
+        lines = ["%-20s %12d" % item for item in self.get_counters().items()]
+        lines += ["%-20s %12.6f sec" % item
+                  for item in self.get_times().items()]
+        return "\n".join(lines)
+
+
+class CountingTrie(Trie):
+    """
+    This class wraps a dictionary and counts and times every lookup the
+    searches make through the node API. A child that is found is a visited
+    node, a missing child is a pruned branch
+    """
+    def __init__(self, trie, stats):
+        """
+        This function initializes a new instance
+        :param trie: Trie - dictionary to wrap
+        :param stats: SearchStats - where the counts go
+        """
+        self.__trie = trie
+        self.__stats = stats
+
+    def get_root(self):
+        """
+        This function returns the root node of the wrapped dictionary
+        :return: Node
+        """
+        return self.__trie.get_root()
+
+    def get_child(self, node, letters):
+        """
+        This function advances from a node and counts the lookup
+        :param node: Node to start from
+        :param letters: String - one or more letters
+        :return: Node - the node reached, or None
+        """
+        start = time.perf_counter()
+        child = self.__trie.get_child(node, letters)
+        self.__stats.add_time("lookup", time.perf_counter() - start)
+        self.__stats.add("dictionary_lookups")
+        self.__stats.add("branches_pruned" if child is None
+                         else "nodes_visited")
+        return child
+
+    def is_word(self, node):
+        """
+        This function checks if a node ends a word and counts the lookup
+        :param node: Node
+        :return: Boolean
+        """
+        start = time.perf_counter()
+        found = self.__trie.is_word(node)
+        self.__stats.add_time("lookup", time.perf_counter() - start)
+        self.__stats.add("dictionary_lookups")
+        return found
+
+    def get_node_key(self, node):
+        """
+        This function returns the key of a node in the wrapped dictionary
+        :param node: Node
+        :return: Hashable key of the node
+        """
+        return self.__trie.get_node_key(node)
+
+    def get_children(self, node):
+        """
+        This function returns the children of a node in the wrapped
+        dictionary
+        :param node: Node
+        :return: List of tuples - (letter, child node)
+        """
+        return self.__trie.get_children(node)
+
+    def __contains__(self, word):
+        """
+        This function checks if a word is in the dictionary and counts the
+        lookup
+        :param word: String - word
+        :return: Boolean
+        """
+        start = time.perf_counter()
+        found = word in self.__trie
+        self.__stats.add_time("lookup", time.perf_counter() - start)
+        self.__stats.add("dictionary_lookups")
+        return found
+
+    def __len__(self):
+        """
+        This function returns the number of words in the dictionary
+        :return: Integer
+        """
+        return len(self.__trie)
+
+
+class CountingWords:
+    """
+    This class wraps a dictionary that is not a trie, e.g. a list of words,
+    and counts and times the membership checks made on it. The searches
+    check a list only once a path is long enough, so a word that is found
+    is a visited node and a missing word is a pruned branch
+    """
+    def __init__(self, words, stats):
+        """
+        This function initializes a new instance
+        :param words: Collection of strings - dictionary to wrap
+        :param stats: SearchStats - where the counts go
+        """
+        self.__words = words
+        self.__stats = stats
+
+    def __contains__(self, word):
+        """
+        This function checks if a word is in the dictionary and counts the
+        lookup
+        :param word: String - word
+        :return: Boolean
+        """
+        start = time.perf_counter()
+        found = word in self.__words
+        self.__stats.add_time("lookup", time.perf_counter() - start)
+        self.__stats.add("dictionary_lookups")
+        self.__stats.add("nodes_visited" if found else "branches_pruned")
+        return found
+
+    def __iter__(self):
+        """
+        This function iterates over the words of the dictionary
+        :return: Iterator of strings - words
+        """
+        return iter(self.__words)
+
+
+def count_words(words, stats):
+    """
+    This function wraps a dictionary so its lookups are counted
+    :param words: Trie or collection of strings - dictionary
+    :param stats: SearchStats - where the counts go
+    :return: CountingTrie or CountingWords
+    """
+    if isinstance(words, Trie):
+        return CountingTrie(words, stats)
+    return CountingWords(words, stats)
+
+
+def profile_search(function, board, words, *args, stats=None):
+    """
+    This function runs one of the boggle_utils searches with counted
+    dictionary lookups and timed phases: preparing the board's lookup
+    tables and, for solve_board and max_score_paths, the trie of the
+    board's words, the lookups, and the rest of the search. The lookup time
+    is measured inside the wrapped dictionary and taken out of the search
+    time, and an iterator is timed until it is exhausted
+    :param function: Function - search to run, e.g. utils.solve_board
+    :param board: List of lists - board
+    :param words: Trie or collection of strings - dictionary
+    :param args: Arguments given before the board, e.g. n for
+    find_length_n_paths
+    :param stats: SearchStats - where to collect, None for new stats
+    :return: Tuple - (result of the search, SearchStats)
+    """
+    if stats is None:
+        stats = SearchStats()
+    start = time.perf_counter()
+    utils.get_geometry(board)
+    if function in TRIE_SEARCHES:
+        words = utils.as_trie(words, board)
+    counting = count_words(words, stats)
+    middle = time.perf_counter()
+    stats.add_time("prepare", middle - start)
+    lookup = stats.get_times().get("lookup", 0.0)
+    result = function(*args, board, counting)
+    if hasattr(result, "__next__"):
+        result = list(result)
+    lookup = stats.get_times().get("lookup", 0.0) - lookup
+    stats.add_time("search", time.perf_counter() - middle - lookup)
+    stats.add("paths_emitted", len(result))
+    stats.notify()
+    return result, stats
+
+
+def main():
+    """
+    This function profiles a search on a seeded board, prints its counters
+    and phase times, and optionally dumps a cProfile file that can be read
+    by pstats, snakeviz or flameprof
+    :return: None
+    """
+    parser = argparse.ArgumentParser(
+        description="Profile a boggle search on a seeded board")
+    parser.add_argument("--search", choices=sorted(SEARCHES),
+                        default="solve_board")
+    parser.add_argument("-n", type=int, default=4,
+                        help="length for the length-n searches")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--board-index", type=int, default=0,
+                        help="which of the seeded boards to profile")
+    parser.add_argument("--dictionary", default=FILE_PATH)
+    parser.add_argument("--profile",
+                        help="dump a cProfile of the search to this file")
+    parser.add_argument("--sort", default=DEFAULT_SORT)
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    board = seeded_boards(args.board_index + 1, args.seed)[-1]
+    words = dictionary_cache.get_dictionary(args.dictionary)
+    function = SEARCHES[args.search]
+    search_args = (args.n,) if args.search in LENGTH_SEARCHES else ()
+    for row in board:
+        print(" ".join("%-2s" % letters for letters in row))
+    result, stats = profile_search(function, board, words, *search_args)
+    print(stats)
+
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        result = function(*search_args, board, words)
+        if hasattr(result, "__next__"):
+            list(result)
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+        pstats.Stats(profiler, stream=sys.stdout).sort_stats(
+            args.sort).print_stats(args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+###################################################################
+# FILE: server_load_test.py
+# WRITER: Daniel Sinai
+# DESCRIPTION: This program measures the boggle server with many
+#              concurrent sessions submitting words
+###################################################################
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import boggle_utils as utils
+import dictionary_cache
+from board import FILE_PATH
+from game import Game
+
+DEFAULT_CLIENTS = 20
+DEFAULT_SESSIONS = 25
+DEFAULT_SUBMISSIONS = 20
+CONNECT_TIMEOUT = 10
+
+
+def measure_session_memory(count):
+    """
+    This function measures how much memory a headless game takes
+    :param count: Integer - number of games to create
+    :return: Float - bytes per game
+    """
+    Game(solve_in_background=False)
+    tracemalloc.start()
+    games = [Game(solve_in_background=False) for _ in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del games
+    return size / count
+
+
+async def request(reader, writer, message):
+    """
+    This function sends a request to the server and waits for its reply
+    :param reader: asyncio.StreamReader
+    :param writer: asyncio.StreamWriter
+    :param message: Dictionary - the request
+    :return: Tuple - (the reply, seconds it took)
+    """
+    start = time.perf_counter()
+    writer.write((json.dumps(message) + "\n").encode())
+    reply = json.loads(await reader.readline())
+    return reply, time.perf_counter() - start
+
+
+async def open_client(path, sessions, submissions, words):
+    """
+    This function opens a connection with its sessions, and finds the paths
+    each session will submit - the words of its board, repeated if there
+    are fewer words than submissions
+    :param path: String - path of the server's socket
+    :param sessions: Integer - number of sessions to open
+    :param submissions: Integer - number of submissions per session
+    :param words: Trie - words from the dictionary, to find paths to submit
+    :return: Tuple - (reader, writer, list of (session, paths))
+    """
+    reader, writer = await asyncio.open_unix_connection(path)
+    games = []
+    for _ in range(sessions):
+        reply, _ = await request(reader, writer, {"op": "new"})
+        paths = list(utils.solve_board(reply["board"], words).values())
+        paths = (paths * submissions)[:submissions] or [[(0, 0)]]
+        games.append((reply["session"], paths))
+    return reader, writer, games
+
+
+async def run_client(client, submissions, latencies):
+    """
+    This function submits the paths of a connection's sessions, round robin
+    over the sessions
+    :param client: Tuple - see open_client
+    :param submissions: Integer - number of submissions per session
+    :param latencies: List - the time of every submission is added to it
+    :return: None
+    """
+    reader, writer, games = client
+    for i in range(submissions):
+        for session, paths in games:
+            _, seconds = await request(
+                reader, writer, {"op": "submit", "session": session,
+                                 "path": paths[i % len(paths)]})
+            latencies.append(seconds)
+
+
+async def close_client(client):
+    """
+    This function ends the sessions of a connection and closes it
+    :param client: Tuple - see open_client
+    :return: None
+    """
+    reader, writer, games = client
+    for session, _ in games:
+        await request(reader, writer, {"op": "end", "session": session})
+    writer.close()
+
+
+async def run_load(path, clients, sessions, submissions, words):
+    """
+    This function opens all the clients and then runs their submissions at
+    once
+    :param path: String - path of the server's socket
+    :param clients: Integer - number of connections
+    :param sessions: Integer - sessions per connection
+    :param submissions: Integer - submissions per session
+    :param words: Trie - words from the dictionary
+    :return: Tuple - (list of submission latencies, seconds of the
+    submissions)
+    """
+    opened = await asyncio.gather(*(open_client(path, sessions, submissions,
+                                                words)
+                                    for _ in range(clients)))
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(client, submissions, latencies)
+                           for client in opened))
+    seconds = time.perf_counter() - start
+    await asyncio.gather(*(close_client(client) for client in opened))
+    return latencies, seconds
+
+
+def wait_for_socket(path, process):
+    """
+    This function waits until the server listens on its socket
+    :param path: String - path of the socket
+    :param process: subprocess.Popen - the server
+    :return: None
+    """
+    deadline = time.monotonic() + CONNECT_TIMEOUT
+    while not os.path.exists(path):
+        if process.poll() is not None or time.monotonic() > deadline:
+            raise RuntimeError("the server did not start")
+        time.sleep(0.05)
+
+
+def percentile(values, fraction):
+    """
+    This function returns a percentile of values
+    :param values: List of floats - sorted values
+    :param fraction: Float - between 0 and 1
+    :return: Float
+    """
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def main():
+    """
+    This function starts a server process, loads it with clients and prints
+    the submissions per second, the latency percentiles and the memory of a
+    session
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description="Boggle server load test")
+    parser.add_argument("--clients", type=int, default=DEFAULT_CLIENTS)
+    parser.add_argument("--sessions", type=int, default=DEFAULT_SESSIONS,
+                        help="sessions per client")
+    parser.add_argument("--submissions", type=int,
+                        default=DEFAULT_SUBMISSIONS,
+                        help="submissions per session")
+    args = parser.parse_args()
+
+    words = dictionary_cache.get_dictionary(FILE_PATH)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "boggle.sock")
+        process = subprocess.Popen([sys.executable, "boggle_server.py",
+                                    "--socket", path],
+                                   cwd=os.path.dirname(
+                                       os.path.abspath(__file__)))
+        try:
+            wait_for_socket(path, process)
+            latencies, seconds = asyncio.run(
+                run_load(path, args.clients, args.sessions,
+                         args.submissions, words))
+        finally:
+            process.terminate()
+            process.wait()
+
+    latencies.sort()
+    print("%d sessions, %d submissions in %.2f sec"
+          % (args.clients * args.sessions, len(latencies), seconds))
+    print("submissions/sec %.1f" % (len(latencies) / seconds))
+    print("latency p50 %.3f ms, p99 %.3f ms, max %.3f ms"
+          % (percentile(latencies, 0.5) * 1000,
+             percentile(latencies, 0.99) * 1000, latencies[-1] * 1000))
+    print("memory per session %.1f KB" % (measure_session_memory(1000) /
+                                          1024))
+
+
+if __name__ == "__main__":
+    main()
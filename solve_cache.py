@@ -0,0 +1,329 @@
+###################################################################
+# FILE: solve_cache.py
+# WRITER: Daniel Sinai
+# DESCRIPTION: This program caches solved boards in memory and on
+#              disk, so the same board is never solved twice
+###################################################################
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
+
+import boggle_utils as utils
+import dictionary_cache
+from board import FILE_PATH
+
+DEFAULT_CACHE_PATH = "solved_boards.db"
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_DISK_BYTES = 64 << 20
+KEY_SEPARATOR = "|"
+
+_caches = {}
+_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def get_symmetries(rows, cols):
+    """
+    This function lists the rotations and reflections of a board that keep
+    its shape - 8 for a square board, 4 otherwise. A symmetry is given as
+    the flat index of the cell that moves to every flat index
+    :param rows: Integer - number of rows
+    :param cols: Integer - number of columns
+    :return: Tuple of tuples - the symmetries, the identity first
+    """
+    last_row, last_col = rows - 1, cols - 1
+    moves = [lambda r, c: (r, c),
+             lambda r, c: (last_row - r, c),
+             lambda r, c: (r, last_col - c),
+             lambda r, c: (last_row - r, last_col - c)]
+    if rows == cols:
+        moves += [lambda r, c: (c, r),
+                  lambda r, c: (c, last_row - r),
+                  lambda r, c: (last_col - c, r),
+                  lambda r, c: (last_col - c, last_row - r)]
+    symmetries = []
+    for move in moves:
+        order = [0] * (rows * cols)
+        for r in range(rows):
+            for c in range(cols):
+                new_r, new_c = move(r, c)
+                order[new_r * cols + new_c] = r * cols + c
+        symmetries.append(tuple(order))
+    return tuple(symmetries)
+
+
+def canonical_board(board):
+    """
+    This function finds the canonical layout of a board - the smallest of
+    its symmetric layouts. Symmetric boards have the same words, so they
+    share a canonical layout
+    :param board: List of lists - board
+    :return: Tuple - (canonical layout as a tuple of cubes, the symmetry
+    that turns the board into it)
+    """
+    letters_list = [letters for row in board for letters in row]
+    return min((tuple(letters_list[index] for index in order), order)
+               for order in get_symmetries(len(board), len(board[0])))
+
+
+def get_fingerprint(board, dictionary_hash):
+    """
+    This function returns the cache key of a board - its canonical layout
+    and the dictionary it is solved with
+    :param board: List of lists - board
+    :param dictionary_hash: String - hash of the dictionary
+    :return: Tuple - (key string, the symmetry that turns the board into
+    its canonical layout)
+    """
+    layout, order = canonical_board(board)
+    key = "%s:%dx%d:%s" % (dictionary_hash, len(board), len(board[0]),
+                           KEY_SEPARATOR.join(layout))
+    return key, order
+
+
+class SolveCache:
+    """
+    This class keeps the solutions of boards in a small in-memory LRU and a
+    size-bounded SQLite file. Solutions are stored for the canonical layout
+    of a board as flat cell indices, and mapped back to the board's own
+    cells when they are read, so a rotated or reflected board is a hit too.
+    Paths of the same length may differ from solving the board itself,
+    since the search visits the cells in another order. The SQLite file may
+    be shared by many processes, and a lookup or store that finds it busy
+    skips the file
+    """
+    def __init__(self, file_path=FILE_PATH, cache_path=DEFAULT_CACHE_PATH,
+                 max_entries=DEFAULT_MAX_ENTRIES,
+                 max_disk_bytes=DEFAULT_MAX_DISK_BYTES):
+        """
+        This function initializes a new instance
+        :param file_path: String - path to the dictionary file
+        :param cache_path: String - path to the SQLite file, or None to keep
+        the solutions in memory only
+        :param max_entries: Integer - number of boards kept in memory
+        :param max_disk_bytes: Integer - size the stored solutions may take
+        on disk
+        """
+        self.__file_path = file_path
+        self.__max_entries = max_entries
+        self.__max_disk_bytes = max_disk_bytes
+        self.__memory = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        self.__connection = None
+        if cache_path is not None:
+            self.__connection = sqlite3.connect(cache_path,
+                                                check_same_thread=False)
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute("PRAGMA synchronous=NORMAL")
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS boards (key TEXT PRIMARY KEY, "
+                "answers BLOB NOT NULL, size INTEGER NOT NULL, "
+                "used REAL NOT NULL)")
+            self.__connection.execute(
+                "CREATE INDEX IF NOT EXISTS boards_used ON boards (used)")
+            self.__connection.commit()
+
+    def solve_board(self, board):
+        """
+        This function finds all the words of a board, like
+        boggle_utils.solve_board, solving it only if neither it nor a
+        symmetric board was solved before
+        :param board: List of lists - board
+        :return: Dictionary - word to its highest scoring path
+        """
+        key, order = get_fingerprint(
+            board, dictionary_cache.get_dictionary_hash(self.__file_path))
+        answers = self.__get(key)
+        if answers is None:
+            answers = self.__solve(order, board)
+            self.__put(key, answers)
+        cells = utils.get_geometry(board)[0]
+        return {word: [cells[order[index]] for index in path]
+                for word, path in answers.items()}
+
+    def store(self, board, answers):
+        """
+        This function stores the solution of a board that was solved
+        elsewhere, e.g. by a board generator
+        :param board: List of lists - board
+        :param answers: Dictionary - word to its highest scoring path
+        :return: None
+        """
+        key, order = get_fingerprint(
+            board, dictionary_cache.get_dictionary_hash(self.__file_path))
+        position = {index: canonical for canonical, index in enumerate(order)}
+        cols = len(board[0])
+        self.__put(key, {word: [position[row * cols + col]
+                                for row, col in path]
+                         for word, path in answers.items()})
+
+    def max_score_paths(self, board):
+        """
+        This function returns the paths of the highest scoring words of a
+        board, like boggle_utils.max_score_paths, through the cache
+        :param board: List of lists - board
+        :return: List of lists of tuples - paths, shorter words first
+        """
+        return utils.get_paths_by_length(self.solve_board(board))
+
+    def __solve(self, order, board):
+        """
+        This function solves the canonical layout of a board
+        :param order: Tuple - the symmetry that turns the board into its
+        canonical layout
+        :param board: List of lists - board
+        :return: Dictionary - word to its path as flat cell indices of the
+        canonical layout
+        """
+        letters_list = [letters for row in board for letters in row]
+        cols = len(board[0])
+        layout = [letters_list[index] for index in order]
+        canonical = [layout[i:i + cols] for i in range(0, len(layout), cols)]
+        words = dictionary_cache.get_dictionary(self.__file_path)
+        return {word: [row * cols + col for row, col in path]
+                for word, path in utils.solve_board(canonical,
+                                                    words).items()}
+
+    def __get(self, key):
+        """
+        This function looks a solution up in memory and then on disk
+        :param key: String - fingerprint of the board
+        :return: Dictionary - the stored solution, or None if there is none
+        """
+        with self.__lock:
+            answers = self.__memory.get(key)
+            if answers is not None:
+                self.__memory.move_to_end(key)
+                self.__stats["memory_hits"] += 1
+                return answers
+            if self.__connection is not None:
+                try:
+                    answers = self.__read(key)
+                except sqlite3.Error:
+                    self.__connection.rollback()
+                if answers is not None:
+                    self.__remember(key, answers)
+                    self.__stats["disk_hits"] += 1
+                    return answers
+            self.__stats["misses"] += 1
+            return
+
+    def __put(self, key, answers):
+        """
+        This function stores a solution in memory and on disk
+        :param key: String - fingerprint of the board
+        :param answers: Dictionary - solution of the canonical layout
+        :return: None
+        """
+        with self.__lock:
+            self.__remember(key, answers)
+            if self.__connection is None:
+                return
+            try:
+                self.__write(key, answers)
+            except sqlite3.Error:
+                self.__connection.rollback()
+
+    def __read(self, key):
+        """
+        This function reads a solution from the SQLite file
+        :param key: String - fingerprint of the board
+        :return: Dictionary - the stored solution, or None if there is none
+        """
+        row = self.__connection.execute(
+            "SELECT answers FROM boards WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return
+        self.__connection.execute("UPDATE boards SET used = ? WHERE key = ?",
+                                  (time.time(), key))
+        self.__connection.commit()
+        return json.loads(zlib.decompress(row[0]))
+
+    def __write(self, key, answers):
+        """
+        This function writes a solution to the SQLite file, evicting the
+        least recently used solutions once they take too much space
+        :param key: String - fingerprint of the board
+        :param answers: Dictionary - solution of the canonical layout
+        :return: None
+        """
+        blob = zlib.compress(json.dumps(answers).encode())
+        self.__connection.execute(
+            "INSERT OR REPLACE INTO boards VALUES (?, ?, ?, ?)",
+            (key, blob, len(blob), time.time()))
+        total = self.__connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM boards").fetchone()[0]
+        if total > self.__max_disk_bytes:
+            evicted = []
+            for old_key, size in self.__connection.execute(
+                    "SELECT key, size FROM boards ORDER BY used"):
+                if total <= self.__max_disk_bytes:
+                    break
+                evicted.append((old_key,))
+                total -= size
+            self.__connection.executemany(
+                "DELETE FROM boards WHERE key = ?", evicted)
+        self.__connection.commit()
+
+    def __remember(self, key, answers):
+        """
+        This function keeps a solution in memory, dropping the least
+        recently used one if there are too many
+        :param key: String - fingerprint of the board
+        :param answers: Dictionary - solution of the canonical layout
+        :return: None
+        """
+        self.__memory[key] = answers
+        self.__memory.move_to_end(key)
+        while len(self.__memory) > self.__max_entries:
+            self.__memory.popitem(last=False)
+
+    def get_stats(self):
+        """
+        This function returns how many lookups were served by every tier
+        :return: Dictionary - number of memory hits, disk hits and misses
+        """
+        with self.__lock:
+            return dict(self.__stats)
+
+    def clear(self):
+        """
+        This function drops all the stored solutions
+        :return: None
+        """
+        with self.__lock:
+            self.__memory.clear()
+            if self.__connection is not None:
+                self.__connection.execute("DELETE FROM boards")
+                self.__connection.commit()
+
+    def close(self):
+        """
+        This function closes the SQLite file
+        :return: None
+        """
+        with self.__lock:
+            if self.__connection is not None:
+                self.__connection.close()
+                self.__connection = None
+
+
+def get_solve_cache(file_path=FILE_PATH, cache_path=DEFAULT_CACHE_PATH):
+    """
+    This function returns a solve cache shared by the whole process
+    :param file_path: String - path to the dictionary file
+    :param cache_path: String - path to the SQLite file, or None for memory
+    only
+    :return: SolveCache
+    """
+    with _lock:
+        cache = _caches.get((file_path, cache_path))
+        if cache is None:
+            cache = SolveCache(file_path, cache_path)
+            _caches[(file_path, cache_path)] = cache
+        return cache
@@ -0,0 +1,501 @@
+###################################################################
+# FILE: test_boggle_utils.py
+# WRITER: Daniel Sinai
+# DESCRIPTION: This program checks that the faster solvers find
+#              the same words as the plain search, on seeded boards
+###################################################################
+import random
+
+import pytest
+
+import boggle_batch
+import boggle_board_randomizer as bbr
+import boggle_utils as utils
+import dice_dictionary
+import dictionary_cache
+import letter_filter
+import multiplayer_round
+import parallel_solve
+import search_profile
+from board import FILE_PATH
+from game import Game
+from game_timer import GameTimer
+from path_validator import PathValidator
+from solve_cache import SolveCache
+
+SEED = 2026
+BOARD_SIZES = ((4, 4), (3, 5), (5, 5))
+BOARDS_PER_SIZE = 3
+DECOYS = ["QQQ", "ZZZZ", "XYZZY"]
+
+
+@pytest.fixture(scope="module")
+def words():
+    """
+    This function loads the dictionary once for all the tests
+    :return: Trie - words from the dictionary
+    """
+    return dictionary_cache.get_dictionary(FILE_PATH)
+
+
+def seeded_boards(sizes=BOARD_SIZES, count=BOARDS_PER_SIZE):
+    """
+    This function creates the same random boards on every run
+    :param sizes: Iterable of tuples - (rows, cols) of the boards
+    :param count: Integer - number of boards of every size
+    :return: List of boards
+    """
+    state = random.getstate()
+    random.seed(SEED)
+    boards = [bbr.randomize_board(bbr.get_dice(rows, cols), rows, cols)
+              for rows, cols in sizes for _ in range(count)]
+    random.setstate(state)
+    return boards
+
+
+def length_sweep(board, words_list):
+    """
+    This function finds the highest scoring path of every word the way
+    max_score_paths used to, with one search per word length
+    :param board: List of lists - board
+    :param words_list: List of strings - words
+    :return: Dictionary - word to its highest scoring path
+    """
+    words_dict = {}
+    for n in range(1, max(map(len, words_list)) + 1):
+        for path in utils.find_length_n_words(n, board, words_list):
+            word = utils.is_valid_path(board, path, words_list)
+            if word not in words_dict or len(words_dict[word]) < len(path):
+                words_dict[word] = path
+    return words_dict
+
+
+def get_lengths(words_dict):
+    """
+    This function returns the path length of every word of a solution
+    :param words_dict: Dictionary - word to path
+    :return: Dictionary - word to the length of its path
+    """
+    return {word: len(path) for word, path in words_dict.items()}
+
+
+@pytest.mark.parametrize("board", seeded_boards(((3, 3),)))
+def test_max_score_paths_matches_length_sweep(board, words):
+    """
+    This function checks max_score_paths against the search per word length
+    on the dictionary words whose letters fit the board, and some decoys
+    :param board: List of lists - board
+    :param words: Trie - words from the dictionary
+    :return: None
+    """
+    words_list = set(letter_filter.filter_words(board, words)) | set(DECOYS)
+    expected = length_sweep(board, words_list)
+    paths = utils.max_score_paths(board, words_list)
+    found = {utils.is_valid_path(board, path, words_list): path
+             for path in paths}
+    assert len(found) == len(paths)
+    assert get_lengths(found) == get_lengths(expected)
+    assert [len(word) for word in found] == sorted(map(len, found))
+
+
+@pytest.mark.parametrize("search, n", (("solve_board", None),
+                                       ("max_score_paths", None),
+                                       ("find_length_n_words", 4),
+                                       ("iter_length_n_paths", 3)))
+@pytest.mark.parametrize("as_list", (False, True))
+def test_profile_search_counts(search, n, as_list, words):
+    """
+    This function checks that a profiled search counts its lookups and
+    splits their time from the rest of the search, for a trie and for a
+    list of words, and still returns what the search returns
+    :param search: String - name of the search
+    :param n: Integer - length for the length-n searches, or None
+    :param as_list: Boolean - whether the dictionary is a list of words
+    :param words: Trie - words from the dictionary
+    :return: None
+    """
+    board = seeded_boards(((3, 3),), 1)[0]
+    dictionary = list(utils.solve_board(board, words)) + DECOYS \
+        if as_list else words
+    args = () if n is None else (n,)
+    function = search_profile.SEARCHES[search]
+    result, stats = search_profile.profile_search(function, board,
+                                                  dictionary, *args)
+    expected = function(*args, board, dictionary)
+    if search.startswith("iter_"):
+        expected = list(expected)
+    assert result == expected
+    counters = stats.get_counters()
+    for name in ("nodes_visited", "branches_pruned", "dictionary_lookups",
+                 "paths_emitted"):
+        assert counters[name] > 0
+    assert set(stats.get_times()) == {"prepare", "lookup", "search"}
+
+
+@pytest.mark.parametrize("rows, cols", BOARD_SIZES)
+def test_numpy_solver_matches_solve_board(rows, cols, words):
+    """
+    This function checks the NumPy batch solver against solve_board
+    :param rows: Integer - number of rows
+    :param cols: Integer - number of columns
+    :param words: Trie - words from the dictionary
+    :return: None
+    """
+    pytest.importorskip("numpy")
+    import numpy_board
+    boards = seeded_boards(((rows, cols),))
+    for board, result in zip(boards, numpy_board.solve_boards(boards, words)):
+        assert list(result.items()) == \
+            list(utils.solve_board(board, words).items())
+    for board, score in zip(boards, numpy_board.score_boards(boards, words)):
+        assert score == sum(len(path) ** 2 for path
+                            in utils.solve_board(board, words).values())
+
+
+@pytest.mark.parametrize("board", seeded_boards())
+def test_solve_board_with_word_list(board, words):
+    """
+    This function checks that a plain list of words, which is filtered by
+    the board's letters, gives the same result as the trie
+    :param board: List of lists - board
+    :param words: Trie - words from the dictionary
+    :return: None
+    """
+    expected = utils.solve_board(board, words)
+    assert list(utils.solve_board(board, list(expected) + DECOYS).items()) \
+        == list(expected.items())
+
+
+def get_variants(board):
+    """
+    This function returns a board with its mirror images, and its transpose
+    if it is square
+    :param board: List of lists - board
+    :return: List of boards
+    """
+    variants = [board, [row[::-1] for row in board], board[::-1],
+                [row[::-1] for row in board[::-1]]]
+    if len(board) == len(board[0]):
+        variants.append([list(row) for row in zip(*board)])
+    return variants
+
+
+@pytest.mark.parametrize("board", seeded_boards())
+def test_solve_cache_maps_symmetries_back(board, words, tmp_path):
+    """
+    This function checks that a board solved through the cache of one of
+    its symmetries gets valid paths on its own cells, of the same lengths
+    as solving it directly
+    :param board: List of lists - board
+    :param words: Trie - words from the dictionary
+    :param tmp_path: Path - a temporary directory
+    :return: None
+    """
+    cache = SolveCache(cache_path=str(tmp_path / "solved_boards.db"))
+    for variant in get_variants(board):
+        expected = utils.solve_board(variant, words)
+        result = cache.solve_board(variant)
+        assert get_lengths(result) == get_lengths(expected)
+        for word, path in result.items():
+            assert utils.is_valid_path(variant, path, words) == word
+    assert cache.get_stats()["misses"] == 1
+
+
+@pytest.mark.parametrize("board", seeded_boards(((4, 4),)))
+def test_solve_cache_store(board, words):
+    """
+    This function checks that a solution stored for a board is served to
+    its mirror image without solving it again
+    :param board: List of lists - board
+    :param words: Trie - words from the dictionary
+    :return: None
+    """
+    cache = SolveCache(cache_path=None)
+    cache.store(board, utils.solve_board(board, words))
+    mirror = [row[::-1] for row in board]
+    result = cache.solve_board(mirror)
+    assert cache.get_stats() == {"memory_hits": 1, "disk_hits": 0,
+                                 "misses": 0}
+    assert get_lengths(result) == get_lengths(utils.solve_board(mirror,
+                                                                words))
+    for word, path in result.items():
+        assert utils.is_valid_path(mirror, path, words) == word
+
+
+@pytest.mark.parametrize("depth", (1, 2))
+@pytest.mark.parametrize("board", seeded_boards())
+def test_parallel_merge_matches_serial(board, depth, words):
+    """
+    This function solves the tasks of a board in this process, in a
+    shuffled order as they may come back from the pool, and checks that
+    merging them keeps the serial result and order
+    :param board: List of lists - board
+    :param depth: Integer - depth the tasks are split at
+    :param words: Trie - words from the dictionary
+    :return: None
+    """
+    boggle_batch.init_worker(FILE_PATH)
+    results = [parallel_solve.solve_subtree(task)
+               for task in parallel_solve.get_tasks(board, depth)]
+    random.Random(SEED).shuffle(results)
+    merged = parallel_solve.merge_results(board, words, results, depth)
+    assert list(merged.items()) == \
+        list(utils.solve_board(board, words).items())
+
+
+def test_parallel_solver_matches_serial(words):
+    """
+    This function checks the process pool solver against solve_board
+    :param words: Trie - words from the dictionary
+    :return: None
+    """
+    boards = seeded_boards(((4, 4), (6, 6)), 1)
+    with parallel_solve.ParallelSolver(2) as solver:
+        for board in boards:
+            assert list(solver.solve_board(board).items()) == \
+                list(utils.solve_board(board, words).items())
+            assert solver.max_score_paths(board) == \
+                utils.max_score_paths(board, words)
+
+
+@pytest.mark.parametrize("board", seeded_boards(((4, 4),)))
+def test_find_word_path_matches_solve_board(board, words):
+    """
+    This function checks that a typed word gets a path as long as the one
+    solve_board found for it
+    :param board: List of lists - board
+    :param words: Trie - words from the dictionary
+    :return: None
+    """
+    for word, path in utils.solve_board(board, words).items():
+        found = utils.find_word_path(board, word)
+        assert found is not None and len(found) == len(path)
+        assert utils.is_valid_path(board, found, words) == word
+
+
+def test_submit_word(words):
+    """
+    This function checks that a typed word scores like its longest path
+    once, and that other input scores nothing
+    :param words: Trie - words from the dictionary
+    :return: None
+    """
+    state = random.getstate()
+    random.seed(SEED)
+    game = Game(solve_in_background=False)
+    random.setstate(state)
+    answers = utils.solve_board(game.get_board_as_list(), words)
+    word = max(answers, key=len)
+    assert game.submit_word(" %s " % word.lower()) == \
+        (word, len(answers[word]) ** Game.SCORE_POWER)
+    assert game.submit_word(word) == (word, 0)
+    assert game.submit_word(DECOYS[0]) == (None, 0)
+    with pytest.raises(TypeError):
+        game.submit_word([word])
+    assert game.get_words_found() == [word]
+
+
+def test_dice_set_spells_multi_letter_faces():
+    """
+    This function checks that every face takes a die of its own, and that
+    a multi-letter face is used as a whole
+    :return: None
+    """
+    dice_set = dice_dictionary.DiceSet([["QU", "A"], ["I", "B"], ["T"]])
+    assert dice_set.can_spell("QUIT")
+    assert dice_set.can_spell("AIT")
+    assert not dice_set.can_spell("QUAT")
+    assert not dice_set.can_spell("QIT")
+    assert not dice_set.can_spell("TT")
+
+
+@pytest.mark.parametrize("rows, cols", BOARD_SIZES)
+def test_dice_dictionary_is_lossless(rows, cols, words):
+    """
+    This function checks that the dictionary reduced to a dice set finds
+    exactly the words of the full dictionary on boards of those dice
+    :param rows: Integer - number of rows
+    :param cols: Integer - number of columns
+    :param words: Trie - words from the dictionary
+    :return: None
+    """
+    dice_list = bbr.get_dice(rows, cols)
+    reduced = dice_dictionary.get_dice_dictionary(
+        FILE_PATH, bbr.get_board_dice(dice_list, rows, cols))
+    for board in seeded_boards(((rows, cols),)):
+        assert list(utils.solve_board(board, reduced).items()) == \
+            list(utils.solve_board(board, words).items())
+
+
+def test_dice_set_is_capped_by_cells():
+    """
+    This function checks that a board with fewer cells than dice cannot
+    spell a word of more faces than cells, and gets a dictionary of its own
+    :return: None
+    """
+    dice_list = [["A"], ["B"], ["C"], ["D"]]
+    assert dice_dictionary.DiceSet(dice_list).can_spell("ABCD")
+    dice_set = dice_dictionary.DiceSet(dice_list, 3)
+    assert dice_set.can_spell("ABC") and dice_set.can_spell("BCD")
+    assert not dice_set.can_spell("ABCD")
+    assert dice_dictionary.get_dice_hash(dice_list, 4) == \
+        dice_dictionary.get_dice_hash(dice_list)
+    assert dice_dictionary.get_dice_hash(dice_list, 3) != \
+        dice_dictionary.get_dice_hash(dice_list)
+
+
+class FakeClock:
+    """
+    This class is a clock that moves only when it is told to sleep
+    """
+    def __init__(self, now=100.0, late=0.0):
+        """
+        This function initializes a new instance
+        :param now: Float - the starting time in seconds
+        :param late: Float - how much longer than asked every sleep takes
+        """
+        self.now = now
+        self.late = late
+        self.sleeps = []
+
+    def __call__(self):
+        """
+        This function returns the current time
+        :return: Float - seconds
+        """
+        return self.now
+
+    def sleep(self, seconds):
+        """
+        This function moves the clock forward
+        :param seconds: Float - how long to sleep
+        :return: None
+        """
+        self.sleeps.append(seconds)
+        self.now += seconds + self.late
+
+
+def test_game_timer_counts_down_from_its_deadline():
+    """
+    This function checks the time left before the start, during the game
+    and after its end
+    :return: None
+    """
+    clock = FakeClock()
+    timer = GameTimer(3, clock)
+    assert not timer.is_started() and not timer.is_over()
+    assert timer.get_time_left() == 3 and timer.get_time_since_end() == 0
+    timer.start()
+    clock.sleep(0.25)
+    assert timer.get_time_left() == 2.75 and timer.get_seconds_left() == 3
+    assert timer.get_next_tick() == 0.75
+    clock.sleep(2.25)
+    assert timer.get_seconds_left() == 1 and timer.get_next_tick() == 0.5
+    clock.sleep(1.5)
+    assert timer.is_over() and timer.get_time_left() == 0
+    assert timer.get_time_since_end() == 1
+
+
+@pytest.mark.parametrize("duration, late, expected",
+                         ((3, 0.0, [3, 2, 1, 0]), (2.5, 0.0, [3, 2, 1, 0]),
+                          (5, 1.5, [5, 3, 1, 0])))
+def test_game_timer_ticks(duration, late, expected):
+    """
+    This function checks that iter_ticks yields every change of the shown
+    seconds, and that sleeping late skips seconds instead of drifting
+    :param duration: Float - length of the game in seconds
+    :param late: Float - how much longer than asked every sleep takes
+    :param expected: List of integers - the seconds yielded
+    :return: None
+    """
+    clock = FakeClock(late=late)
+    timer = GameTimer(duration, clock)
+    assert list(timer.iter_ticks(clock.sleep)) == expected
+    assert timer.is_over()
+    assert timer.get_time_since_end() < 1 + late
+
+
+def test_path_validator_follows_a_path():
+    """
+    This function checks that the validator follows the words of a small
+    board cell by cell, and offers only the cells that keep a prefix
+    :return: None
+    """
+    board = [["C", "A", "T"], ["X", "R", "S"], ["QU", "I", "E"]]
+    validator = PathValidator(board, ["CAT", "CATS", "CART", "ACT"])
+    assert validator.add_cell((0, 0)) and validator.get_word() is None
+    assert validator.get_next_cells() == [(0, 1)]
+    assert validator.add_cell((0, 1))
+    assert validator.get_next_cells() == [(0, 2), (1, 1)]
+    assert validator.add_cell((0, 2)) and validator.get_word() == "CAT"
+    assert validator.get_next_cells() == [(1, 2)]
+    assert validator.add_cell((1, 2)) and validator.get_word() == "CATS"
+    assert validator.get_next_cells() == []
+    validator.reset()
+    assert validator.get_path() == [] and validator.get_word() is None
+    assert sorted(validator.get_next_cells()) == [(0, 0), (0, 1)]
+
+
+@pytest.mark.parametrize("path", ([(0, 0), (0, 0), (0, 1)],
+                                  [(0, 0), (0, 2)], [(0, 0), (1, 0)],
+                                  [(0, 0), (5, 5), (0, 1)]))
+def test_path_validator_dead_path(path):
+    """
+    This function checks that a repeated, disconnected or unknown cell, or
+    letters no word starts with, kill the path until it is reset
+    :param path: List of tuples - path that dies at its second cell
+    :return: None
+    """
+    board = [["C", "A", "T"], ["X", "R", "S"], ["QU", "I", "E"]]
+    validator = PathValidator(board, ["CAT", "CATS", "CART", "ACT"])
+    assert validator.add_cell(path[0])
+    for cell in path[1:]:
+        assert not validator.add_cell(cell)
+    assert not validator.is_alive() and validator.get_word() is None
+    assert validator.get_next_cells() == [] and validator.get_path() == path
+    validator.reset()
+    assert validator.is_alive() and validator.add_cell((0, 1))
+
+
+@pytest.mark.parametrize("board", seeded_boards(((4, 4),)))
+def test_path_validator_matches_is_valid_path(board, words):
+    """
+    This function checks the validator against is_valid_path on every path
+    solve_board found
+    :param board: List of lists - board
+    :param words: Trie - words from the dictionary
+    :return: None
+    """
+    validator = PathValidator(board, words)
+    for word, path in utils.solve_board(board, words).items():
+        validator.reset()
+        assert all(validator.add_cell(cell) for cell in path[:-1])
+        validator.add_cell(path[-1])
+        assert validator.get_word() == word
+
+
+def test_resolve_round_cancels_shared_words(words):
+    """
+    This function checks that a word found by two players scores for
+    neither, that a path submitted twice counts once, and that invalid
+    paths are counted
+    :param words: Trie - words from the dictionary
+    :return: None
+    """
+    state = random.getstate()
+    random.seed(SEED)
+    game = Game(solve_in_background=False)
+    random.setstate(state)
+    answers = utils.solve_board(game.get_board_as_list(), words)
+    first, shared, last = list(answers)[:3]
+    submissions = {"alice": [answers[first], answers[shared],
+                             [(0, 0), (0, 0)], [(9, 9)]],
+                   "bob": [answers[shared], answers[last], answers[last]],
+                   "carol": []}
+    results = multiplayer_round.resolve_round(game, submissions)
+    assert results == {
+        "alice": {"score": game.calculate_word_score(answers[first]),
+                  "words": [first], "cancelled": [shared], "invalid": 2},
+        "bob": {"score": game.calculate_word_score(answers[last]),
+                "words": [last], "cancelled": [shared], "invalid": 0},
+        "carol": {"score": 0, "words": [], "cancelled": [], "invalid": 0}}
@@ -0,0 +1,165 @@
+###################################################################
+# FILE: trie.py
+# WRITER: Daniel Sinai
+# DESCRIPTION: This program implements the Trie class - a compact
+#              prefix tree for the boggle dictionary
+###################################################################
+
+END_OF_WORD = ""
+
+
+class Trie:
+    """
+    This class represents a read-only prefix tree of words. Identical
+    suffixes are shared between the words (a DAWG), which keeps the whole
+    boggle dictionary small enough to be held in memory.
+    A node is an opaque handle - use get_root, get_child and is_word to walk
+    the tree, so other dictionary implementations can offer the same API.
+    """
+    def __init__(self, words=()):
+        """
+        This function initializes a new instance
+        :param words: Iterable of strings - words for the trie
+        """
+        self.__root = {}
+        self.__size = 0
+        self.__build(sorted(set(words)))
+
+    def __build(self, sorted_words):
+        """
+        This function inserts the sorted words to the trie and merges nodes
+        with identical subtrees while doing so
+        :param sorted_words: List of strings - sorted words without repeats
+        :return: None
+        """
+        register = {}
+        unchecked = []
+        previous_word = ""
+        for word in sorted_words:
+            common = 0
+            max_common = min(len(word), len(previous_word))
+            while common < max_common and word[common] == \
+                    previous_word[common]:
+                common += 1
+            self.__minimize(register, unchecked, common)
+            node = unchecked[-1][2] if unchecked else self.__root
+            for letter in word[common:]:
+                next_node = {}
+                node[letter] = next_node
+                unchecked.append((node, letter, next_node))
+                node = next_node
+            node[END_OF_WORD] = True
+            self.__size += 1
+            previous_word = word
+        self.__minimize(register, unchecked, 0)
+
+    def __minimize(self, register, unchecked, down_to):
+        """
+        This function replaces the unchecked nodes that are deeper than
+        down_to with an identical registered node, if there is one
+        :param register: Dictionary - node signature to node
+        :param unchecked: List of tuples - (parent, letter, child)
+        :param down_to: Integer - depth to stop at
+        :return: None
+        """
+        while len(unchecked) > down_to:
+            parent, letter, child = unchecked.pop()
+            signature = tuple((key, id(value)) for key, value in
+                              child.items())
+            registered = register.get(signature)
+            if registered is None:
+                register[signature] = child
+            else:
+                parent[letter] = registered
+
+    def get_root(self):
+        """
+        This function returns the root node of the trie
+        :return: Node - root node
+        """
+        return self.__root
+
+    def get_child(self, node, letters):
+        """
+        This function advances from a node along the given letters
+        :param node: Node - node to start from
+        :param letters: String - one or more letters (e.g. a 'QU' cube)
+        :return: Node - the node reached, or None if no word continues so
+        """
+        for letter in letters:
+            node = node.get(letter)
+            if node is None:
+                return
+        return node
+
+    def is_word(self, node):
+        """
+        This function checks if a node ends a word
+        :param node: Node
+        :return: Boolean
+        """
+        return END_OF_WORD in node
+
+    def get_node_key(self, node):
+        """
+        This function returns a hashable key that identifies a node
+        :param node: Node
+        :return: Hashable key of the node
+        """
+        return id(node)
+
+    def get_node(self, prefix):
+        """
+        This function returns the node of a given prefix
+        :param prefix: String - prefix
+        :return: Node - the prefix's node, or None if no word starts with it
+        """
+        return self.get_child(self.get_root(), prefix)
+
+    def has_prefix(self, prefix):
+        """
+        This function checks if some word starts with the given prefix
+        :param prefix: String - prefix
+        :return: Boolean
+        """
+        return self.get_node(prefix) is not None
+
+    def __contains__(self, word):
+        """
+        This function checks if a word is in the trie
+        :param word: String - word
+        :return: Boolean
+        """
+        if not isinstance(word, str):
+            return False
+        node = self.get_node(word)
+        return node is not None and self.is_word(node)
+
+    def __len__(self):
+        """
+        This function returns the number of words in the trie
+        :return: Integer
+        """
+        return self.__size
+
+    def get_children(self, node):
+        """
+        This function returns the children of a node
+        :param node: Node
+        :return: List of tuples - (letter, child node) in sorted order
+        """
+        return [(letter, child) for letter, child in node.items()
+                if letter != END_OF_WORD]
+
+    def __iter__(self):
+        """
+        This function iterates over the words of the trie in sorted order
+        :return: Iterator of strings - words
+        """
+        stack = [(self.get_root(), "")]
+        while stack:
+            node, prefix = stack.pop()
+            if self.is_word(node):
+                yield prefix
+            for letter, child in reversed(self.get_children(node)):
+                stack.append((child, prefix + letter))
@@ -0,0 +1,171 @@
+###################################################################
+# FILE: word_store.py
+# WRITER: Daniel Sinai
+# DESCRIPTION: This program implements the WordStore class - a compact
+#              read-only set of sorted words packed in one buffer
+###################################################################
+import sys
+from array import array
+from itertools import accumulate
+
+from trie import Trie
+
+ENCODING = "utf-8"
+PREFIX_END = b"\xff"
+
+
+class WordStore(Trie):
+    """
+    This class represents a read-only set of words. The sorted words are
+    packed one after the other in a single bytes buffer, and an offsets
+    array marks where every word starts, so the whole dictionary takes a
+    few MB instead of one Python string per word. Membership and prefix
+    queries are binary searches.
+    It also offers the node API of Trie - a node is the range of words that
+    share a prefix - so it can be given to the solvers as well
+    """
+    def __init__(self, words=()):
+        """
+        This function initializes a new instance
+        :param words: Iterable of strings - words for the store
+        """
+        encoded = sorted(set(word.encode(ENCODING) for word in words))
+        self.__buffer = b"".join(encoded)
+        self.__offsets = array("I", accumulate(map(len, encoded), initial=0))
+
+    def __word_at(self, index):
+        """
+        This function returns the encoded word at a given index
+        :param index: Integer - index of the word
+        :return: Bytes - word
+        """
+        return self.__buffer[self.__offsets[index]:self.__offsets[index + 1]]
+
+    def __search(self, key, low=0, high=None):
+        """
+        This function finds the first word that is not smaller than a key
+        :param key: Bytes - encoded key
+        :param low: Integer - first index to search
+        :param high: Integer - index to stop searching at
+        :return: Integer - index of the word
+        """
+        if high is None:
+            high = len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self.__word_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def get_prefix_range(self, prefix, low=0, high=None):
+        """
+        This function finds the words that start with a given prefix
+        :param prefix: String - prefix
+        :param low: Integer - first index to search
+        :param high: Integer - index to stop searching at
+        :return: Tuple - (first index, index after the last one)
+        """
+        key = prefix.encode(ENCODING)
+        first = self.__search(key, low, high)
+        return first, self.__search(key + PREFIX_END, first, high)
+
+    def get_words_with_prefix(self, prefix):
+        """
+        This function returns the words that start with a given prefix
+        :param prefix: String - prefix
+        :return: Iterator of strings - words in sorted order
+        """
+        first, last = self.get_prefix_range(prefix)
+        for index in range(first, last):
+            yield self.__word_at(index).decode(ENCODING)
+
+    def get_memory_size(self):
+        """
+        This function returns how much memory the store takes
+        :return: Integer - size in bytes
+        """
+        return sys.getsizeof(self.__buffer) + sys.getsizeof(self.__offsets)
+
+    def get_root(self):
+        """
+        This function returns the root node - the range of all the words
+        :return: Tuple - (first index, index after the last one, prefix)
+        """
+        return 0, len(self), ""
+
+    def get_child(self, node, letters):
+        """
+        This function advances from a node along the given letters
+        :param node: Tuple - node to start from
+        :param letters: String - one or more letters (e.g. a 'QU' cube)
+        :return: Tuple - the node reached, or None if no word continues so
+        """
+        low, high, prefix = node
+        prefix += letters
+        low, high = self.get_prefix_range(prefix, low, high)
+        if low == high:
+            return
+        return low, high, prefix
+
+    def is_word(self, node):
+        """
+        This function checks if a node ends a word
+        :param node: Tuple - node
+        :return: Boolean
+        """
+        low, high, prefix = node
+        return low < high and self.__word_at(low) == prefix.encode(ENCODING)
+
+    def get_node_key(self, node):
+        """
+        This function returns a hashable key that identifies a node
+        :param node: Tuple - node
+        :return: Tuple - the node itself
+        """
+        return node
+
+    def get_children(self, node):
+        """
+        This function returns the children of a node
+        :param node: Tuple - node
+        :return: List of tuples - (letter, child node) in sorted order
+        """
+        low, high, prefix = node
+        if self.is_word(node):
+            low += 1
+        children = []
+        while low < high:
+            letter = self.__word_at(low).decode(ENCODING)[len(prefix)]
+            child = self.get_child((low, high, prefix), letter)
+            children.append((letter, child))
+            low = child[1]
+        return children
+
+    def __contains__(self, word):
+        """
+        This function checks if a word is in the store
+        :param word: String - word
+        :return: Boolean
+        """
+        if not isinstance(word, str):
+            return False
+        key = word.encode(ENCODING)
+        index = self.__search(key)
+        return index < len(self) and self.__word_at(index) == key
+
+    def __len__(self):
+        """
+        This function returns the number of words in the store
+        :return: Integer
+        """
+        return len(self.__offsets) - 1
+
+    def __iter__(self):
+        """
+        This function iterates over the words of the store in sorted order
+        :return: Iterator of strings - words
+        """
+        for index in range(len(self)):
+            yield self.__word_at(index).decode(ENCODING)